@@ -5,25 +5,45 @@ Base Tool - Enhanced plugin foundation with type-driven schema generation
 Provides abstract base class and utilities for creating MCP tools with minimal boilerplate.
 Uses type hints to automatically generate JSON schemas.
 """
+import functools
 import inspect
-import logging
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from functools import lru_cache
-from typing import Any, Dict, Union, get_args, get_origin, get_type_hints
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 
 
-@dataclass
 class ToolResult:
     """Standardized tool execution result"""
 
-    content: list[Dict[str, Any]] = field(default_factory=list)
+    __slots__ = ("content",)
+
+    def __init__(self, content: Optional[List[Dict[str, Any]]] = None):
+        self.content: List[Dict[str, Any]] = content if content is not None else []
 
     def add_text(self, text: str) -> "ToolResult":
         """Add text content"""
         self.content.append({"type": "text", "text": text})
         return self
 
+    def add_text_batch(self, texts: Iterable[str]) -> "ToolResult":
+        """Add several text items with a single list extend"""
+        self.content.extend([{"type": "text", "text": text} for text in texts])
+        return self
+
     def add_image(self, data: str, mime_type: str = "image/png") -> "ToolResult":
         """Add image content"""
         self.content.append({"type": "image", "data": data, "mimeType": mime_type})
@@ -31,15 +51,99 @@ class ToolResult:
 
     def add_json(self, data: Any) -> "ToolResult":
         """Add structured JSON data"""
-        import json
+        from json_codec import dumps_pretty
 
-        self.content.append({"type": "text", "text": json.dumps(data, indent=2)})
+        self.content.append({"type": "text", "text": dumps_pretty(data)})
         return self
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to MCP response format"""
         return {"content": self.content}
 
+    def __repr__(self) -> str:
+        return f"ToolResult(content={self.content!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ToolResult):
+            return NotImplemented
+        return self.content == other.content
+
+
+# JSON schema fragments for basic types; read-only because they are shared
+# by every generated schema. The type names are interned so all schemas
+# reference the same string objects.
+_TYPE_MAP: Dict[Any, Mapping[str, Any]] = {
+    python_type: MappingProxyType({"type": sys.intern(json_type)})
+    for python_type, json_type in (
+        (str, "string"),
+        (int, "integer"),
+        (float, "number"),
+        (bool, "boolean"),
+        (list, "array"),
+        (dict, "object"),
+    )
+}
+_DEFAULT_JSON_TYPE = _TYPE_MAP[str]
+_NONE_TYPE = type(None)
+
+
+def _python_type_to_json_type(python_type: Any) -> Mapping[str, Any]:
+    """Convert a Python type hint to a (shared, read-only) JSON schema fragment"""
+    try:
+        hash(python_type)
+    except TypeError:  # Unhashable annotation object - can't be memoized
+        return _convert_type_hint(python_type)
+    return _cached_convert_type_hint(python_type)
+
+
+def _convert_type_hint(python_type: Any) -> Mapping[str, Any]:
+    """Uncached body of _python_type_to_json_type"""
+    origin = get_origin(python_type)
+
+    # Handle Optional/Union types
+    if origin is Union:
+        args = get_args(python_type)
+        if len(args) == 2 and _NONE_TYPE in args:
+            # Optional[T] case - the only branch that needs a fresh dict
+            non_none_type = args[0] if args[1] is _NONE_TYPE else args[1]
+            base_schema = _python_type_to_json_type(non_none_type)
+            return MappingProxyType({**base_schema, "nullable": True})
+
+    try:
+        return _TYPE_MAP.get(origin or python_type, _DEFAULT_JSON_TYPE)
+    except TypeError:  # Unhashable hint - not in the map
+        return _DEFAULT_JSON_TYPE
+
+
+_cached_convert_type_hint = functools.cache(_convert_type_hint)
+
+
+def _build_schema_from_params(
+    params: Tuple[Tuple[str, Mapping[str, Any], bool], ...]
+) -> Dict[str, Any]:
+    """Build an object schema from (name, json_type, is_required) tuples"""
+    schema = {
+        "type": "object",
+        "properties": {name: dict(json_type) for name, json_type, _ in params},
+    }
+
+    # Required if no default value
+    required = [name for name, _, is_required in params if is_required]
+    if required:
+        schema["required"] = required
+
+    return schema
+
+
+# BaseTool subclasses by defining module, recorded as each class is created
+# so plugin discovery is a lookup rather than a scan
+_TOOL_CLASSES_BY_MODULE: Dict[str, List[Type["BaseTool"]]] = {}
+
+
+def get_tool_classes(module_name: str) -> Tuple[Type["BaseTool"], ...]:
+    """BaseTool subclasses defined in the named module, in definition order"""
+    return tuple(_TOOL_CLASSES_BY_MODULE.get(module_name, ()))
+
 
 class BaseTool(ABC):
     """
@@ -55,72 +159,75 @@ class BaseTool(ABC):
     name: str = ""
     description: str = ""
 
-    @abstractmethod
-    async def execute(self, **kwargs) -> ToolResult:
-        """Execute the tool with typed parameters"""
-        pass
-
-    @property
-    @lru_cache(maxsize=1)
-    def input_schema(self) -> Dict[str, Any]:
-        """Auto-generate JSON schema from execute() type hints"""
-        return self._generate_schema()
-
-    def _generate_schema(self) -> Dict[str, Any]:
-        """Generate JSON schema from execute method signature"""
-        sig = inspect.signature(self.execute)
-        type_hints = get_type_hints(self.execute)
+    # Set to True when execute() is an async generator yielding content
+    # items; HTTP clients then receive the result as a chunked stream
+    stream: bool = False
 
-        properties = {}
-        required = []
+    # Set to True for deterministic tools (same arguments, same result);
+    # servers may then reuse a result for up to cache_ttl seconds
+    cacheable: bool = False
+    cache_ttl: float = 300.0
 
-        for param_name, param in sig.parameters.items():
-            if param_name == "self":
-                continue
+    # Set to True when input_schema describes the accepted arguments exactly;
+    # servers may then reject non-conforming tools/call arguments up front
+    validate_arguments: bool = False
 
-            param_type = type_hints.get(param_name, str)
-            json_type = self._python_type_to_json_type(param_type)
+    # Per-class schema cache, filled in by __init_subclass__
+    _cached_input_schema: Optional[Dict[str, Any]] = None
 
-            properties[param_name] = json_type
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # A re-executed module redefines its classes; replace the stale ones
+        classes = _TOOL_CLASSES_BY_MODULE.setdefault(cls.__module__, [])
+        classes[:] = [known for known in classes if known.__qualname__ != cls.__qualname__]
+        classes.append(cls)
 
-            # Required if no default value
-            if param.default == inspect.Parameter.empty:
-                required.append(param_name)
+        if "input_schema" in cls.__dict__:
+            return  # Subclass supplies its own schema (e.g. DecoratorTool)
 
-        schema = {"type": "object", "properties": properties}
+        # Introspect execute() once per class instead of on every access
+        try:
+            cls._cached_input_schema = cls._generate_schema()
+        except Exception:
+            # Unresolvable hints are reported later by tool validation
+            cls._cached_input_schema = None
 
-        if required:
-            schema["required"] = required
+    @abstractmethod
+    async def execute(self, **kwargs) -> ToolResult:
+        """Execute the tool with typed parameters"""
+        pass
 
+    @property
+    def input_schema(self) -> Dict[str, Any]:
+        """Auto-generated JSON schema from execute() type hints (cached per class)"""
+        schema = self._cached_input_schema
+        if schema is None:
+            cls = type(self)
+            schema = cls._cached_input_schema = cls._generate_schema()
         return schema
 
+    @classmethod
+    def _generate_schema(cls) -> Dict[str, Any]:
+        """Generate JSON schema from execute method signature"""
+        sig = inspect.signature(cls.execute)
+        type_hints = get_type_hints(cls.execute)
+
+        # Reduce the inspect objects to plain tuples up front
+        params = tuple(
+            (
+                param_name,
+                _python_type_to_json_type(type_hints.get(param_name, str)),
+                param.default is inspect.Parameter.empty,
+            )
+            for param_name, param in sig.parameters.items()
+            if param_name != "self"
+        )
+        return _build_schema_from_params(params)
+
     @staticmethod
     def _python_type_to_json_type(python_type: type) -> Dict[str, Any]:
         """Convert Python type hints to JSON schema types"""
-        origin = get_origin(python_type)
-
-        # Handle Optional/Union types
-        if origin is Union:
-            args = get_args(python_type)
-            if len(args) == 2 and type(None) in args:
-                # Optional[T] case
-                non_none_type = next(arg for arg in args if arg is not type(None))
-                base_schema = BaseTool._python_type_to_json_type(non_none_type)
-                base_schema["nullable"] = True
-                return base_schema
-
-        # Handle basic types
-        type_mapping = {
-            str: {"type": "string"},
-            int: {"type": "integer"},
-            float: {"type": "number"},
-            bool: {"type": "boolean"},
-            list: {"type": "array"},
-            dict: {"type": "object"},
-        }
-
-        base_type = origin or python_type
-        return type_mapping.get(base_type, {"type": "string"})
+        return dict(_python_type_to_json_type(python_type))
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}: {self.name}>"
@@ -159,8 +266,7 @@ if __name__ == "__main__":
             self, text: str, count: int = 1, optional_flag: bool = False
         ) -> ToolResult:
             result = ToolResult()
-            for i in range(count):
-                result.add_text(f"{i+1}: {text}")
+            result.add_text_batch(f"{i+1}: {text}" for i in range(count))
 
             if optional_flag:
                 result.add_text("Optional flag was set!")
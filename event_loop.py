@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Event Loop - Shared asyncio entry point for the server launchers
+
+Runs the server coroutine on uvloop (libuv-backed event loop) when it is
+installed, and falls back to the default asyncio loop otherwise - uvloop is
+not available on Windows. On Windows the network servers run on the selector
+loop instead of the default ProactorEventLoop, which keeps an idle server
+from spinning CPU.
+"""
+import asyncio
+import sys
+from typing import Any, Coroutine
+
+try:
+    import uvloop
+except ImportError:  # Optional dependency
+    uvloop = None
+
+
+def _run_with(loop_factory: Any, main: Coroutine[Any, Any, Any]) -> Any:
+    """asyncio.run() on a loop created by loop_factory"""
+    if hasattr(asyncio, "Runner"):  # Python 3.11+
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            return runner.run(main)
+
+    loop = loop_factory()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(main)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """Drop-in replacement for asyncio.run() that prefers uvloop
+
+    Not for the stdio servers on Windows: the selector loop cannot read pipes.
+    """
+    if uvloop is not None:
+        if hasattr(asyncio, "Runner"):
+            return _run_with(uvloop.new_event_loop, main)
+        uvloop.install()
+        return asyncio.run(main)
+
+    if sys.platform == "win32":
+        return _run_with(asyncio.SelectorEventLoop, main)
+
+    return asyncio.run(main)
@@ -6,246 +6,79 @@ Provides HTTP-based transport for MCP with REST-style endpoints.
 Good for simple request/response patterns and web integrations.
 """
 import asyncio
-import json
+import gzip
+import hashlib
 import logging
-from dataclasses import asdict
-from typing import Any, Dict, Optional
-
-import aiohttp
-from aiohttp import ClientSession, web
-
-from transport import MCPRequest, MCPResponse
-
-
-class HTTPTransport:
-    """
-    HTTP-based MCP transport with REST-style endpoints.
-
-    Endpoints:
-    - POST /mcp          - Send MCP JSON-RPC requests
-    - GET  /tools        - List available tools
-    - POST /tools/{name} - Call specific tool
-    - GET  /health       - Server health check
-    - GET  /stats        - Server statistics
-    """
-
-    def __init__(self, host: str = "localhost", port: int = 8080):
-        self.host = host
-        self.port = port
-        self.app = web.Application()
-        self.request_handler = None
-        self.plugin_manager = None
-        self._setup_routes()
-        self._setup_cors()
-
-    def set_request_handler(self, handler):
-        """Set the MCP request handler"""
-        self.request_handler = handler
-
-    def set_plugin_manager(self, plugin_manager):
-        """Set plugin manager for direct tool access"""
-        self.plugin_manager = plugin_manager
-
-    def _setup_routes(self):
-        """Setup HTTP routes"""
-        # MCP JSON-RPC endpoint
-        self.app.router.add_post("/mcp", self._handle_mcp_request)
-
-        # REST-style tool endpoints
-        self.app.router.add_get("/tools", self._handle_list_tools)
-        self.app.router.add_post("/tools/{tool_name}", self._handle_call_tool)
-
-        # Utility endpoints
-        self.app.router.add_get("/health", self._handle_health)
-        self.app.router.add_get("/stats", self._handle_stats)
-
-        # Documentation endpoint
-        self.app.router.add_get("/", self._handle_docs)
-
-        # Static file serving for web client (optional)
-        self.app.router.add_get("/client", self._handle_web_client)
-
-    def _setup_cors(self):
-        """Setup CORS for web browser access"""
-
-        @web.middleware
-        async def cors_handler(request, handler):
-            response = await handler(request)
-            response.headers["Access-Control-Allow-Origin"] = "*"
-            response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
-            response.headers["Access-Control-Allow-Headers"] = "Content-Type"
-            return response
-
-        # Add CORS middleware
-        self.app.middlewares.append(cors_handler)
-
-        # Handle preflight requests
-        async def options_handler(request):
-            return web.Response(
-                headers={
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-                    "Access-Control-Allow-Headers": "Content-Type",
-                }
-            )
-
-        self.app.router.add_options("/{path:.*}", options_handler)
-
-    async def _handle_mcp_request(self, request: web.Request) -> web.Response:
-        """Handle MCP JSON-RPC requests"""
-        try:
-            data = await request.json()
-
-            # Create MCP request
-            mcp_request = MCPRequest(
-                id=data.get("id"),
-                method=data.get("method"),
-                params=data.get("params", {}),
-            )
-
-            # Handle via MCP handler
-            if not self.request_handler:
-                return web.json_response(
-                    {
-                        "jsonrpc": "2.0",
-                        "id": mcp_request.id,
-                        "error": {
-                            "code": -32603,
-                            "message": "No request handler configured",
-                        },
-                    },
-                    status=500,
-                )
-
-            response = await self.request_handler(mcp_request)
-
-            # Convert to JSON-RPC response
-            response_data = {"jsonrpc": "2.0", "id": response.id}
-
-            if response.result is not None:
-                response_data["result"] = response.result
-            elif response.error is not None:
-                response_data["error"] = response.error
-
-            return web.json_response(response_data)
-
-        except json.JSONDecodeError:
-            return web.json_response(
-                {
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {"code": -32700, "message": "Parse error"},
-                },
-                status=400,
-            )
-        except Exception as e:
-            logging.error(f"❌ MCP request error: {e}")
-            return web.json_response(
-                {
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
-                },
-                status=500,
-            )
-
-    async def _handle_list_tools(self, request: web.Request) -> web.Response:
-        """Handle GET /tools - List available tools"""
-        try:
-            if not self.plugin_manager:
-                return web.json_response(
-                    {"error": "Plugin manager not configured"}, status=500
-                )
-
-            tools_registry = self.plugin_manager.get_tool_registry()
-            tools_list = list(tools_registry.values())
-
-            return web.json_response({"tools": tools_list, "count": len(tools_list)})
-
-        except Exception as e:
-            logging.error(f"❌ List tools error: {e}")
-            return web.json_response({"error": str(e)}, status=500)
-
-    async def _handle_call_tool(self, request: web.Request) -> web.Response:
-        """Handle POST /tools/{tool_name} - Call specific tool"""
-        try:
-            tool_name = request.match_info["tool_name"]
-
-            # Get arguments from request body
-            try:
-                arguments = await request.json()
-            except:
-                arguments = {}
-
-            if not self.plugin_manager:
-                return web.json_response(
-                    {"error": "Plugin manager not configured"}, status=500
-                )
-
-            # Execute tool
-            result = await self.plugin_manager.execute_tool(tool_name, arguments)
-
-            return web.json_response(
-                {
-                    "tool": tool_name,
-                    "arguments": arguments,
-                    "result": result,
-                    "status": "success",
-                }
-            )
-
-        except Exception as e:
-            logging.error(f"❌ Tool call error: {e}")
-            return web.json_response(
-                {
-                    "tool": tool_name,
-                    "arguments": arguments,
-                    "error": str(e),
-                    "status": "error",
-                },
-                status=500,
-            )
-
-    async def _handle_health(self, request: web.Request) -> web.Response:
-        """Handle GET /health - Health check"""
-        health_data = {
-            "status": "healthy",
-            "server": "HTTP MCP Server",
-            "version": "2.0.0",
-            "timestamp": asyncio.get_event_loop().time(),
-            "tools_loaded": len(self.plugin_manager.loaded_tools)
-            if self.plugin_manager
-            else 0,
-        }
-
-        return web.json_response(health_data)
-
-    async def _handle_stats(self, request: web.Request) -> web.Response:
-        """Handle GET /stats - Server statistics"""
-        try:
-            stats = {
-                "server": {
-                    "name": "HTTP MCP Server",
-                    "version": "2.0.0",
-                    "transport": "HTTP",
-                    "host": self.host,
-                    "port": self.port,
-                }
-            }
-
-            if self.plugin_manager:
-                plugin_stats = self.plugin_manager.get_stats()
-                stats["plugins"] = plugin_stats
-
-            return web.json_response(stats)
+import signal
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiohttp import web
+
+import json_codec
+from base_tool import ToolError
+from transport import (
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    MCPRequest,
+    MCPResponse,
+)
+
+
+logger = logging.getLogger(__name__)
+
+_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+
+async def _add_cors_headers(request: web.Request, response: web.StreamResponse) -> None:
+    """on_response_prepare hook that stamps the static CORS headers"""
+    response.headers.update(_CORS_HEADERS)
+
+
+# Pre-encoded JSON-RPC envelope pieces; only the id / message vary per call
+_RPC_PREFIX = b'{"jsonrpc":"2.0","id":'
+_PARSE_ERROR_BODY = _RPC_PREFIX + (
+    b'null,"error":'
+    + json_codec.dumps({"code": PARSE_ERROR, "message": "Parse error"})
+    + b"}"
+)
+_NO_HANDLER_SUFFIX = (
+    b',"error":'
+    + json_codec.dumps(
+        {"code": INTERNAL_ERROR, "message": "No request handler configured"}
+    )
+    + b"}"
+)
+_INTERNAL_ERROR_PREFIX = (
+    _RPC_PREFIX
+    + b'null,"error":{"code":'
+    + str(INTERNAL_ERROR).encode()
+    + b',"message":'
+)
+
+
+# Fields of the /health payload that never change
+_HEALTH_STATIC = {
+    "status": "healthy",
+    "server": "HTTP MCP Server",
+    "version": "2.0.0",
+}
+
+
+def _json_response(data: Any, status: int = 200) -> web.Response:
+    """JSON response encoded with the fast codec (replaces web.json_response)"""
+    return web.Response(
+        body=json_codec.dumps(data), status=status, content_type="application/json"
+    )
 
-        except Exception as e:
-            logging.error(f"❌ Stats error: {e}")
-            return web.json_response({"error": str(e)}, status=500)
 
-    async def _handle_docs(self, request: web.Request) -> web.Response:
-        """Handle GET / - API documentation"""
-        docs_html = """
+# Static HTML pages
+_DOCS_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -310,13 +143,9 @@ curl -X POST http://localhost:8080/tools/opensearch \\
     </pre>
 </body>
 </html>
-        """
-
-        return web.Response(text=docs_html, content_type="text/html")
+"""
 
-    async def _handle_web_client(self, request: web.Request) -> web.Response:
-        """Handle GET /client - Simple web client interface"""
-        client_html = """
+_CLIENT_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -412,31 +241,380 @@ curl -X POST http://localhost:8080/tools/opensearch \\
     </script>
 </body>
 </html>
+"""
+
+class _StaticPage:
+    """HTML page encoded, gzipped and hashed once at import time"""
+
+    __slots__ = ("body", "gzip_body", "etag")
+
+    def __init__(self, html: str):
+        self.body = html.encode("utf-8")
+        self.gzip_body = gzip.compress(self.body)
+        self.etag = f'"{hashlib.md5(self.body).hexdigest()}"'
+
+    def response(self, request: web.Request) -> web.Response:
+        """Serve the page, answering 304 when the client copy is current"""
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": "public, max-age=3600",
+            "Vary": "Accept-Encoding",
+        }
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304, headers=headers)
+
+        body = self.body
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = self.gzip_body
+            headers["Content-Encoding"] = "gzip"
+
+        return web.Response(
+            body=body, content_type="text/html", charset="utf-8", headers=headers
+        )
+
+
+_DOCS_PAGE = _StaticPage(_DOCS_HTML)
+_CLIENT_PAGE = _StaticPage(_CLIENT_HTML)
+
+
+class HTTPTransport:
+    """
+    HTTP-based MCP transport with REST-style endpoints.
+
+    Endpoints:
+    - POST /mcp          - Send MCP JSON-RPC requests
+    - GET  /tools        - List available tools
+    - POST /tools/{name} - Call specific tool
+    - GET  /health       - Server health check
+    - GET  /stats        - Server statistics
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 8080):
+        self.host = host
+        self.port = port
+        self.app = web.Application()
+        self.request_handler = None
+        self.plugin_manager = None
+        # Pre-serialized tool listings, rebuilt when the plugin set changes
+        self._tools_list_body: Optional[bytes] = None
+        self._tools_rpc_result: Optional[Dict[str, Any]] = None
+        self._tools_rpc_suffix: Optional[bytes] = None
+        self._shutdown: Optional[asyncio.Event] = None
+        self._setup_routes()
+        self._setup_cors()
+
+    def set_request_handler(self, handler):
+        """Set the MCP request handler"""
+        self.request_handler = handler
+
+    def set_plugin_manager(self, plugin_manager):
+        """Set plugin manager for direct tool access"""
+        self.plugin_manager = plugin_manager
+        plugin_manager.register_change_callback(self._rebuild_tools_cache)
+
+    def _rebuild_tools_cache(self):
+        """Serialize the tool listing once so list requests skip re-encoding"""
+        tools_list = list(self.plugin_manager.get_tool_registry().values())
+        self._tools_list_body = json_codec.dumps(
+            {"tools": tools_list, "count": len(tools_list)}
+        )
+        # JSON-RPC tools/list result; only the request id varies per call
+        self._tools_rpc_result = {"tools": tools_list}
+        self._tools_rpc_suffix = (
+            b',"result":' + json_codec.dumps(self._tools_rpc_result) + b"}"
+        )
+
+    def tools_list_result(self) -> Dict[str, Any]:
+        """tools/list result for request handlers; returned as is, it is sent
+        from the pre-serialized payload instead of being encoded again"""
+        if self._tools_rpc_result is None:
+            self._rebuild_tools_cache()
+        return self._tools_rpc_result
+
+    def _setup_routes(self):
+        """Setup HTTP routes"""
+        # MCP JSON-RPC endpoint
+        self.app.router.add_post("/mcp", self._handle_mcp_request)
+
+        # REST-style tool endpoints
+        self.app.router.add_get("/tools", self._handle_list_tools)
+        self.app.router.add_post("/tools/{tool_name}", self._handle_call_tool)
+
+        # Utility endpoints
+        self.app.router.add_get("/health", self._handle_health, allow_head=False)
+        self.app.router.add_head("/health", self._handle_health_head)
+        self.app.router.add_get("/stats", self._handle_stats)
+
+        # Documentation endpoint
+        self.app.router.add_get("/", self._handle_docs)
+
+        # Static file serving for web client (optional)
+        self.app.router.add_get("/client", self._handle_web_client)
+
+    def _setup_cors(self):
+        """Setup CORS for web browser access"""
+        # Headers are applied from a static dict when each response is
+        # prepared, instead of through a per-request middleware frame
+        self.app.on_response_prepare.append(_add_cors_headers)
+
+        # Handle preflight requests (CORS headers added on prepare)
+        async def options_handler(request):
+            return web.Response()
+
+        # One OPTIONS route per registered endpoint, rather than a catch-all
+        # regex route the router would have to try on every request
+        for resource in list(self.app.router.resources()):
+            resource.add_route("OPTIONS", options_handler)
+
+    async def _handle_mcp_request(self, request: web.Request) -> web.Response:
+        """Handle MCP JSON-RPC requests"""
+        try:
+            # Decode straight into an MCP request
+            mcp_request = MCPRequest.from_json(await request.read())
+
+            # Handle via MCP handler
+            if not self.request_handler:
+                return web.Response(
+                    body=_RPC_PREFIX
+                    + json_codec.dumps(mcp_request.id)
+                    + _NO_HANDLER_SUFFIX,
+                    status=500,
+                    content_type="application/json",
+                )
+
+            response = await self.request_handler(mcp_request)
+
+            # The cached tools/list result goes out pre-serialized
+            if (
+                response.result is not None
+                and response.result is self._tools_rpc_result
+            ):
+                body = (
+                    _RPC_PREFIX + json_codec.dumps(response.id) + self._tools_rpc_suffix
+                )
+                return web.Response(body=body, content_type="application/json")
+
+            # Convert to JSON-RPC response
+            response_data = {"jsonrpc": "2.0", "id": response.id}
+
+            if response.result is not None:
+                response_data["result"] = response.result
+            elif response.error is not None:
+                response_data["error"] = response.error
+
+            return _json_response(response_data)
+
+        except json_codec.JSONDecodeError:
+            return web.Response(
+                body=_PARSE_ERROR_BODY, status=400, content_type="application/json"
+            )
+        except Exception as e:
+            logger.error("❌ MCP request error: %s", e)
+            return web.Response(
+                body=_INTERNAL_ERROR_PREFIX
+                + json_codec.dumps(f"Internal error: {str(e)}")
+                + b"}}",
+                status=500,
+                content_type="application/json",
+            )
+
+    async def _handle_list_tools(self, request: web.Request) -> web.Response:
+        """Handle GET /tools - List available tools"""
+        try:
+            if not self.plugin_manager:
+                return _json_response(
+                    {"error": "Plugin manager not configured"}, status=500
+                )
+
+            if self._tools_list_body is None:
+                self._rebuild_tools_cache()
+
+            return web.Response(
+                body=self._tools_list_body, content_type="application/json"
+            )
+
+        except Exception as e:
+            logger.error("❌ List tools error: %s", e)
+            return _json_response({"error": str(e)}, status=500)
+
+    async def _handle_call_tool(self, request: web.Request) -> web.Response:
+        """Handle POST /tools/{tool_name} - Call specific tool"""
+        try:
+            tool_name = request.match_info["tool_name"]
+
+            # Get arguments from request body
+            try:
+                arguments = json_codec.loads(await request.read())
+            except:
+                arguments = {}
+
+            if not self.plugin_manager:
+                return _json_response(
+                    {"error": "Plugin manager not configured"}, status=500
+                )
+
+            # Streaming tools are written out item by item
+            tool = self.plugin_manager.loaded_tools.get(tool_name)
+            if tool is not None and tool.stream:
+                return await self._stream_call_tool(request, tool_name, arguments)
+
+            # Execute tool
+            result = await self.plugin_manager.execute_tool(tool_name, arguments)
+
+            return _json_response(
+                {
+                    "tool": tool_name,
+                    "arguments": arguments,
+                    "result": result,
+                    "status": "success",
+                }
+            )
+
+        except Exception as e:
+            logger.error("❌ Tool call error: %s", e)
+            return _json_response(
+                {
+                    "tool": tool_name,
+                    "arguments": arguments,
+                    "error": str(e),
+                    "status": "error",
+                },
+                status=500,
+            )
+
+    async def _stream_call_tool(
+        self, request: web.Request, tool_name: str, arguments: Dict[str, Any]
+    ) -> web.StreamResponse:
+        """Write a streaming tool's content items as chunked JSON.
+
+        The body has the same shape as a buffered call, but each content
+        item is sent as soon as the tool yields it.
         """
+        items = self.plugin_manager.stream_tool(tool_name, arguments)
+
+        # Pull the first item before sending headers so argument and
+        # startup errors still produce a regular error response
+        try:
+            first_item = await items.__anext__()
+        except StopAsyncIteration:
+            first_item = None
+
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+
+        await response.write(
+            b'{"tool":'
+            + json_codec.dumps(tool_name)
+            + b',"arguments":'
+            + json_codec.dumps(arguments)
+            + b',"result":{"content":['
+        )
+
+        try:
+            if first_item is not None:
+                await response.write(json_codec.dumps(first_item))
+                async for item in items:
+                    await response.write(b"," + json_codec.dumps(item))
+            tail = b']},"status":"success"}'
+        except Exception as e:
+            # Headers are already sent; report the failure inside the body
+            logger.error("❌ Tool stream error: %s", e)
+            tail = b']},"status":"error","error":' + json_codec.dumps(str(e)) + b"}"
 
-        return web.Response(text=client_html, content_type="text/html")
+        await response.write(tail)
+        await response.write_eof()
+        return response
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        """Handle GET /health - Health check"""
+        health_data = {
+            **_HEALTH_STATIC,
+            "timestamp": asyncio.get_running_loop().time(),
+            "tools_loaded": len(self.plugin_manager.loaded_tools)
+            if self.plugin_manager
+            else 0,
+        }
+
+        return _json_response(health_data)
+
+    async def _handle_health_head(self, request: web.Request) -> web.Response:
+        """Handle HEAD /health - Liveness probe without building a body"""
+        return web.Response(status=200)
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        """Handle GET /stats - Server statistics"""
+        try:
+            stats = {
+                "server": {
+                    "name": "HTTP MCP Server",
+                    "version": "2.0.0",
+                    "transport": "HTTP",
+                    "host": self.host,
+                    "port": self.port,
+                }
+            }
+
+            if self.plugin_manager:
+                plugin_stats = self.plugin_manager.get_stats()
+                stats["plugins"] = plugin_stats
+
+            return _json_response(stats)
+
+        except Exception as e:
+            logger.error("❌ Stats error: %s", e)
+            return _json_response({"error": str(e)}, status=500)
+
+    async def _handle_docs(self, request: web.Request) -> web.Response:
+        """Handle GET / - API documentation"""
+        return _DOCS_PAGE.response(request)
+
+    async def _handle_web_client(self, request: web.Request) -> web.Response:
+        """Handle GET /client - Simple web client interface"""
+        return _CLIENT_PAGE.response(request)
 
     async def start_server(self):
-        """Start the HTTP server"""
-        runner = web.AppRunner(self.app)
+        """Start the HTTP server and serve until shutdown is requested"""
+        # Created here so the event is bound to the running loop
+        self._shutdown = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.request_shutdown)
+            signal_installed = True
+        except (NotImplementedError, RuntimeError):
+            signal_installed = False  # No signal handlers on Windows / non-main thread
+
+        try:
+            await self._serve_until_shutdown()
+        finally:
+            if signal_installed:
+                loop.remove_signal_handler(signal.SIGINT)
+
+    async def _serve_until_shutdown(self):
+        """Run the site until the shutdown event is set"""
+        # Per-request access logging is disabled; it sits on the hot path
+        runner = web.AppRunner(self.app, access_log=None)
         await runner.setup()
 
         site = web.TCPSite(runner, self.host, self.port)
         await site.start()
 
-        logging.info(f"🚀 HTTP MCP Server started on http://{self.host}:{self.port}")
-        logging.info(f"📋 API Documentation: http://{self.host}:{self.port}/")
-        logging.info(f"🌐 Web Client: http://{self.host}:{self.port}/client")
+        logger.info("🚀 HTTP MCP Server started on http://%s:%s", self.host, self.port)
+        logger.info("📋 API Documentation: http://%s:%s/", self.host, self.port)
+        logger.info("🌐 Web Client: http://%s:%s/client", self.host, self.port)
 
-        # Keep server running
+        # Keep server running without waking the loop
         try:
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
-            logging.info("👋 HTTP server shutdown requested")
+            await self._shutdown.wait()
+            logger.info("👋 HTTP server shutdown requested")
         finally:
             await runner.cleanup()
 
+    def request_shutdown(self):
+        """Ask a running start_server() to stop and clean up"""
+        if self._shutdown is not None:
+            self._shutdown.set()
+
 
 # HTTP MCP Server
 class HTTPMCPServer:
@@ -453,36 +631,31 @@ class HTTPMCPServer:
     async def start(self):
         """Start the HTTP MCP server"""
         # Load plugins
-        tools = await self.plugin_manager.discover_and_load_tools()
-        logging.info(f"🔧 Loaded {len(tools)} tools: {list(tools.keys())}")
+        tools = await self.plugin_manager.ensure_loaded()
+        logger.info("🔧 Loaded %d tools: %s", len(tools), list(tools))
 
         # Start HTTP server
         await self.transport.start_server()
 
     async def _handle_request(self, request: MCPRequest) -> MCPResponse:
         """Handle MCP requests (same as WebSocket server)"""
+        handler = self._METHOD_TABLE.get(request.method)
+        if handler is None:
+            return MCPResponse(
+                id=request.id,
+                error={
+                    "code": METHOD_NOT_FOUND,
+                    "message": f"Method not found: {request.method}",
+                },
+            )
+
         try:
-            if request.method == "initialize":
-                return await self._handle_initialize(request)
-            elif request.method == "initialized":
-                return await self._handle_initialized(request)
-            elif request.method == "tools/list":
-                return await self._handle_tools_list(request)
-            elif request.method == "tools/call":
-                return await self._handle_tools_call(request)
-            else:
-                return MCPResponse(
-                    id=request.id,
-                    error={
-                        "code": -32601,
-                        "message": f"Method not found: {request.method}",
-                    },
-                )
+            return await handler(self, request)
         except Exception as e:
-            logging.error(f"❌ Error handling {request.method}: {e}")
+            logger.error("❌ Error handling %s: %s", request.method, e)
             return MCPResponse(
                 id=request.id,
-                error={"code": -32603, "message": f"Internal error: {str(e)}"},
+                error={"code": INTERNAL_ERROR, "message": f"Internal error: {str(e)}"},
             )
 
     async def _handle_initialize(self, request: MCPRequest) -> MCPResponse:
@@ -504,10 +677,7 @@ class HTTPMCPServer:
 
     async def _handle_tools_list(self, request: MCPRequest) -> MCPResponse:
         """Handle tools/list request"""
-        tools_registry = self.plugin_manager.get_tool_registry()
-        tools_list = list(tools_registry.values())
-        result = {"tools": tools_list}
-        return MCPResponse(id=request.id, result=result)
+        return MCPResponse(id=request.id, result=self.transport.tools_list_result())
 
     async def _handle_tools_call(self, request: MCPRequest) -> MCPResponse:
         """Handle tools/call request"""
@@ -516,12 +686,10 @@ class HTTPMCPServer:
 
         if not tool_name:
             return MCPResponse(
-                id=request.id, error={"code": -32602, "message": "Missing tool name"}
+                id=request.id, error={"code": INVALID_PARAMS, "message": "Missing tool name"}
             )
 
         try:
-            from plugin_manager import ToolError
-
             result = await self.plugin_manager.execute_tool(tool_name, arguments)
             return MCPResponse(id=request.id, result=result)
         except ToolError as e:
@@ -529,20 +697,31 @@ class HTTPMCPServer:
                 id=request.id, error={"code": e.code, "message": e.message}
             )
         except Exception as e:
-            logging.error(f"❌ Tool execution error: {e}")
+            logger.error("❌ Tool execution error: %s", e)
             return MCPResponse(
                 id=request.id,
-                error={"code": -32603, "message": f"Tool error: {str(e)}"},
+                error={"code": INTERNAL_ERROR, "message": f"Tool error: {str(e)}"},
             )
 
+    # MCP method name -> handler, resolved with one dict lookup per request
+    _METHOD_TABLE: Dict[
+        str, Callable[["HTTPMCPServer", MCPRequest], Awaitable[MCPResponse]]
+    ] = {
+        "initialize": _handle_initialize,
+        "initialized": _handle_initialized,
+        "tools/list": _handle_tools_list,
+        "tools/call": _handle_tools_call,
+    }
+
 
 # Example usage
 if __name__ == "__main__":
+    import event_loop
 
     async def main():
         from plugin_manager import PluginManager
 
-        plugin_manager = PluginManager("tools")
+        plugin_manager = PluginManager.shared("tools")
         server = HTTPMCPServer(plugin_manager, host="localhost", port=8080)
 
         await server.start()
@@ -550,4 +729,4 @@ if __name__ == "__main__":
     logging.basicConfig(
         level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
     )
-    asyncio.run(main())
+    event_loop.run(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+JSON Codec - Fast JSON encoding shared by the MCP transports
+
+Uses orjson (C extension) when it is installed and falls back to the
+stdlib json module otherwise. All encoders return UTF-8 bytes, ready to be
+written to a socket or used as an aiohttp response body.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# keep catching the stdlib exception either way.
+JSONDecodeError = json.JSONDecodeError
+
+
+if orjson is not None:
+
+    def dumps(data: Any) -> bytes:
+        """Serialize data to compact JSON bytes"""
+        # Non-str keys are stringified, as json.dumps does
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+    def dumps_pretty(data: Any) -> str:
+        """Serialize data to indented JSON text (for human-readable tool output)"""
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+    def dumps_canonical(data: Any) -> bytes:
+        """Serialize data with sorted keys (stable bytes for cache keys)"""
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
+    _RESULT_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_NAIVE_UTC
+        | orjson.OPT_UTC_Z
+    )
+
+    def dumps_result(data: Any) -> bytes:
+        """Serialize tool output that may hold datetime, UUID, NumPy or non-str keys"""
+        return orjson.dumps(data, option=_RESULT_OPTIONS)
+
+    loads = orjson.loads
+
+else:
+
+    def dumps(data: Any) -> bytes:
+        """Serialize data to compact JSON bytes"""
+        return json.dumps(data, separators=(",", ":")).encode()
+
+    def dumps_pretty(data: Any) -> str:
+        """Serialize data to indented JSON text (for human-readable tool output)"""
+        return json.dumps(data, indent=2)
+
+    def dumps_canonical(data: Any) -> bytes:
+        """Serialize data with sorted keys (stable bytes for cache keys)"""
+        return json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
+
+    def _result_default(value: Any) -> Any:
+        """datetime/date -> ISO 8601, NumPy -> lists/scalars, anything else -> str"""
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        if hasattr(value, "tolist"):
+            return value.tolist()
+        return str(value)
+
+    def dumps_result(data: Any) -> bytes:
+        """Serialize tool output that may hold datetime, UUID, NumPy or non-str keys"""
+        return json.dumps(data, separators=(",", ":"), default=_result_default).encode()
+
+    loads = json.loads
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+MCP Server Launcher - One entry point for every transport
+
+    python3 launcher.py --transport http|sse|websocket|stdio
+
+Only the chosen transport's module (and its dependencies) is imported. The
+server_*.py scripts are thin shims around main() for their transport.
+"""
+import argparse
+import asyncio
+import importlib
+import logging
+import sys
+from typing import Any, Dict, List, NamedTuple
+
+import event_loop
+from plugin_manager import PluginManager
+
+
+class _Transport(NamedTuple):
+    """How to build and announce one network transport"""
+    module: str
+    server_class: str
+    port: int
+    log_level: int
+    log_format: str
+    banner: List[str]
+
+
+_LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_TRANSPORTS: Dict[str, _Transport] = {
+    "http": _Transport(
+        "http_transport", "HTTPMCPServer", 8080, logging.INFO, _LOG_FORMAT,
+        [
+            "🚀 Starting HTTP MCP Server",
+            "🔗 Base URL: http://localhost:8080",
+            "📋 API Docs: http://localhost:8080/",
+            "🌐 Web Client: http://localhost:8080/client",
+        ],
+    ),
+    "sse": _Transport(
+        "sse_transport", "SSEMCPServer", 8081, logging.DEBUG,
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        [
+            "🌊 Starting SSE MCP Server",
+            "📡 URL: http://localhost:8081",
+            "🔗 Streaming endpoints:",
+            "   • GET /stream/tools/{name}?arg1=val1&arg2=val2",
+            "   • GET /stream/llm?prompt=hello&model=gpt-4",
+            "   • GET /stream/mcp?method=tools/list",
+            "📋 Documentation: http://localhost:8081/",
+        ],
+    ),
+    "websocket": _Transport(
+        "websocket_transport", "WebSocketMCPServer", 8765, logging.INFO, _LOG_FORMAT,
+        [
+            "🚀 Starting WebSocket MCP Server",
+            "🔗 URL: ws://localhost:8765",
+        ],
+    ),
+}
+
+
+async def _serve(name: str, tools_dir: str, host: str) -> None:
+    """Build the named network transport's server and run it"""
+    spec = _TRANSPORTS[name]
+    logging.basicConfig(level=spec.log_level, format=spec.log_format, stream=sys.stderr)
+
+    # Imported here so a launch only loads the transport it runs
+    server_class = getattr(importlib.import_module(spec.module), spec.server_class)
+    server: Any = server_class(PluginManager.shared(tools_dir), host=host, port=spec.port)
+
+    for line in spec.banner:
+        print(line)
+    print("👋 Press Ctrl+C to stop")
+
+    try:
+        await server.start()
+    except KeyboardInterrupt:
+        print("\n👋 Server shutdown requested")
+        shutdown = getattr(getattr(server, "transport", None), "shutdown", None)
+        if shutdown is not None:
+            await shutdown()
+
+
+def main(transport: str, tools_dir: str = "tools", host: str = "localhost") -> None:
+    """Run the MCP server on the given transport (blocks until it stops)"""
+    if transport == "stdio":
+        # stdout carries the protocol, so no banner; asyncio.run() because
+        # the selector loop used on Windows cannot read the stdin pipe
+        import server_v2
+
+        logging.basicConfig(level=logging.INFO, format=_LOG_FORMAT, stream=sys.stderr)
+        asyncio.run(server_v2.main(tools_dir))
+        return
+
+    if transport not in _TRANSPORTS:
+        raise ValueError(f"Unknown transport: {transport}")
+    event_loop.run(_serve(transport, tools_dir, host))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the MCP plugin server")
+    parser.add_argument("--transport", choices=[*_TRANSPORTS, "stdio"], default="stdio")
+    parser.add_argument("--tools-dir", default="tools")
+    parser.add_argument("--host", default="localhost")
+    args = parser.parse_args()
+
+    main(args.transport, args.tools_dir, args.host)
@@ -5,14 +5,25 @@ MCP HTTP Transport - Proper JSON-RPC 2.0 MCP Client
 Maintains full MCP protocol compliance while using HTTP transport.
 This is a proper MCP client that speaks JSON-RPC 2.0 over HTTP.
 """
-import asyncio
-import json
+import itertools
 import logging
-import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
 
+try:
+    import httpx  # Optional: HTTP/2 transport (pip install "httpx[http2]")
+except ImportError:
+    httpx = None
+
+try:
+    import msgpack  # Optional: msgpack wire format (pip install msgpack)
+except ImportError:
+    msgpack = None
+
+import event_loop
+import json_codec
+
 
 class MCPHTTPClient:
     """
@@ -22,12 +33,24 @@ class MCPHTTPClient:
     - JSON-RPC 2.0 message structure
     - Standard MCP methods (initialize, tools/list, tools/call)
     - Proper protocol handshake and versioning
+    
+    With http2=True the client uses httpx, multiplexing concurrent calls over
+    a single connection. HTTP/2 is negotiated via TLS (ALPN), so it needs an
+    https:// endpoint such as a reverse proxy in front of the server.
+    
+    With use_msgpack=True /mcp bodies are sent and received as
+    application/msgpack instead of JSON; the JSON-RPC envelopes are the same.
     """
     
-    def __init__(self, base_url: str = "http://localhost:8081", timeout: float = 30.0):
+    def __init__(self, base_url: str = "http://localhost:8081", timeout: float = 30.0,
+                 http2: bool = False, use_msgpack: bool = False):
         self.base_url = base_url.rstrip("/")
         self.mcp_endpoint = f"{self.base_url}/mcp"
         self.timeout = timeout
+        self.http2 = http2
+        self.use_msgpack = use_msgpack
+        # Per-request header override; JSON is the session default
+        self._post_headers = {"Content-Type": "application/msgpack"} if use_msgpack else None
         
         # MCP protocol state
         self.protocol_version = "2024-11-05"
@@ -39,8 +62,11 @@ class MCPHTTPClient:
         self.server_capabilities = {}
         self.server_info = {}
         
-        # HTTP session
-        self.session: Optional[aiohttp.ClientSession] = None
+        # JSON-RPC request ids - the server only echoes them back
+        self._request_ids = itertools.count(1)
+        
+        # HTTP session (httpx.AsyncClient when http2=True)
+        self.session: Optional[Any] = None
         self.logger = logging.getLogger("mcp_http_client")
         
     async def __aenter__(self):
@@ -55,8 +81,31 @@ class MCPHTTPClient:
     async def connect(self):
         """Connect to MCP server and perform handshake"""
         # Create HTTP session
-        timeout = aiohttp.ClientTimeout(total=self.timeout)
-        self.session = aiohttp.ClientSession(timeout=timeout)
+        if self.use_msgpack and msgpack is None:
+            raise RuntimeError("use_msgpack=True requires msgpack: pip install msgpack")
+        if self.http2:
+            if httpx is None:
+                raise RuntimeError('http2=True requires httpx: pip install "httpx[http2]"')
+            self.session = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+                timeout=self.timeout,
+                headers={"Content-Type": "application/json"},
+            )
+        else:
+            # Keep-alive pool so the handshake and every tools/call reuse one socket
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=32,
+                keepalive_timeout=75,
+                ttl_dns_cache=300,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                headers={"Content-Type": "application/json"},
+            )
         
         try:
             # MCP handshake: initialize
@@ -74,12 +123,15 @@ class MCPHTTPClient:
     async def disconnect(self):
         """Disconnect from server"""
         if self.session:
-            await self.session.close()
+            if self.http2:
+                await self.session.aclose()
+            else:
+                await self.session.close()
             self.session = None
         self.initialized = False
         self.logger.info("👋 MCP client disconnected")
     
-    async def _send_jsonrpc_request(self, method: str, params: Dict[str, Any] = None, request_id: str = None) -> Any:
+    async def _send_jsonrpc_request(self, method: str, params: Dict[str, Any] = None, request_id: Optional[int] = None) -> Any:
         """Send JSON-RPC 2.0 request to MCP server"""
         if not self.session:
             raise RuntimeError("Not connected to server")
@@ -95,27 +147,118 @@ class MCPHTTPClient:
         if request_id is not None:
             request_data["id"] = request_id
         
-        self.logger.debug(f"Sending MCP request: {method}")
+        self.logger.debug("Sending MCP request: %s", method)
+        
+        response_data = await self._post(request_data)
+        if response_data is None:  # Notification acknowledged, no body
+            return None
+        return self._unwrap_response(response_data)
+    
+    async def send_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Send several JSON-RPC requests in one POST (JSON-RPC 2.0 batch)
+        
+        Results are returned in the order of ``calls``; the first error
+        response raises RuntimeError like a single request would.
+        """
+        if not self.session:
+            raise RuntimeError("Not connected to server")
+        
+        batch = []
+        for method, params in calls:
+            batch.append({
+                "jsonrpc": "2.0",
+                "id": next(self._request_ids),
+                "method": method,
+                "params": params or {}
+            })
+        
+        self.logger.debug("Sending MCP batch: %d requests", len(batch))
+        
+        response_data = await self._post(batch)
+        if not isinstance(response_data, list):
+            # Whole-batch failure (e.g. invalid request) comes back as one error
+            return [self._unwrap_response(response_data or {})]
+        
+        responses = {item.get("id"): item for item in response_data}
+        return [self._unwrap_response(responses.get(item["id"], {})) for item in batch]
+    
+    async def _post(self, payload: Any) -> Any:
+        """POST a JSON-RPC payload, returning the decoded body or None for 204"""
+        if self.http2:
+            return await self._post_http2(payload)
         
         try:
-            async with self.session.post(self.mcp_endpoint, json=request_data) as response:
+            async with self.session.post(
+                self.mcp_endpoint, data=self._encode(payload), headers=self._post_headers
+            ) as response:
+                if response.status == 204:
+                    return None
                 if response.status != 200:
                     error_text = await response.text()
                     raise ConnectionError(f"HTTP {response.status}: {error_text}")
                 
-                response_data = await response.json()
-                
-                # Handle JSON-RPC response
-                if "error" in response_data:
-                    error = response_data["error"]
-                    raise RuntimeError(f"MCP Error [{error['code']}]: {error['message']}")
-                
-                return response_data.get("result")
+                return self._decode(await response.read())
                 
         except aiohttp.ClientError as e:
             raise ConnectionError(f"HTTP request failed: {e}")
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"Invalid JSON response: {e}")
+    
+    async def _post_http2(self, payload: Any) -> Any:
+        """_post() over the httpx HTTP/2 client"""
+        try:
+            response = await self.session.post(
+                self.mcp_endpoint, content=self._encode(payload), headers=self._post_headers
+            )
+        except httpx.HTTPError as e:
+            raise ConnectionError(f"HTTP request failed: {e}")
+        
+        if response.status_code == 204:
+            return None
+        if response.status_code != 200:
+            raise ConnectionError(f"HTTP {response.status_code}: {response.text}")
+        
+        return self._decode(response.content)
+    
+    def _encode(self, payload: Any) -> bytes:
+        """Encode a /mcp request body in the configured wire format"""
+        if self.use_msgpack:
+            return msgpack.packb(payload)
+        return json_codec.dumps(payload)
+    
+    def _decode(self, raw: bytes) -> Any:
+        """Decode a /mcp response body in the configured wire format"""
+        try:
+            if self.use_msgpack:
+                return msgpack.unpackb(raw, raw=False)
+            return json_codec.loads(raw)
+        except ValueError as e:  # JSONDecodeError and msgpack's unpack errors
+            raise RuntimeError(f"Invalid {'msgpack' if self.use_msgpack else 'JSON'} response: {e}")
+    
+    async def _get_json(self, path: str, what: str) -> Any:
+        """GET a non-MCP JSON endpoint"""
+        if not self.session:
+            raise RuntimeError("Not connected to server")
+        
+        if self.http2:
+            try:
+                response = await self.session.get(f"{self.base_url}{path}")
+            except httpx.HTTPError as e:
+                raise ConnectionError(f"{what} failed: {e}")
+            status, body = response.status_code, response.content
+        else:
+            async with self.session.get(f"{self.base_url}{path}") as response:
+                status, body = response.status, await response.read()
+        
+        if status != 200:
+            raise ConnectionError(f"{what} failed: HTTP {status}")
+        return json_codec.loads(body)
+    
+    def _unwrap_response(self, response_data: Dict[str, Any]) -> Any:
+        """Return the JSON-RPC result or raise on an error response"""
+        if "error" in response_data:
+            error = response_data["error"]
+            raise RuntimeError(f"MCP Error [{error['code']}]: {error['message']}")
+        
+        return response_data.get("result")
     
     async def _send_jsonrpc_notification(self, method: str, params: Dict[str, Any] = None):
         """Send JSON-RPC 2.0 notification (no response expected)"""
@@ -129,7 +272,7 @@ class MCPHTTPClient:
             "capabilities": {}  # Client capabilities
         }
         
-        result = await self._send_jsonrpc_request("initialize", params, str(uuid.uuid4()))
+        result = await self._send_jsonrpc_request("initialize", params, next(self._request_ids))
         
         # Store server info
         self.server_capabilities = result.get("capabilities", {})
@@ -137,9 +280,12 @@ class MCPHTTPClient:
         
         server_version = result.get("protocolVersion")
         if server_version != self.protocol_version:
-            self.logger.warning(f"Protocol version mismatch: client={self.protocol_version}, server={server_version}")
+            self.logger.warning("Protocol version mismatch: client=%s, server=%s", self.protocol_version, server_version)
         
-        self.logger.info(f"Server: {self.server_info.get('name', 'unknown')} v{self.server_info.get('version', 'unknown')}")
+        self.logger.info(
+            "Server: %s v%s",
+            self.server_info.get("name", "unknown"), self.server_info.get("version", "unknown")
+        )
     
     async def _send_initialized(self):
         """Send initialized notification"""
@@ -151,7 +297,7 @@ class MCPHTTPClient:
         if not self.initialized:
             raise RuntimeError("Client not initialized")
         
-        result = await self._send_jsonrpc_request("tools/list", {}, str(uuid.uuid4()))
+        result = await self._send_jsonrpc_request("tools/list", {}, next(self._request_ids))
         return result.get("tools", [])
     
     async def call_tool(self, name: str, arguments: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -164,30 +310,16 @@ class MCPHTTPClient:
             "arguments": arguments or {}
         }
         
-        result = await self._send_jsonrpc_request("tools/call", params, str(uuid.uuid4()))
+        result = await self._send_jsonrpc_request("tools/call", params, next(self._request_ids))
         return result
     
     async def get_health(self) -> Dict[str, Any]:
         """Get server health (non-MCP endpoint)"""
-        if not self.session:
-            raise RuntimeError("Not connected to server")
-        
-        async with self.session.get(f"{self.base_url}/health") as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                raise ConnectionError(f"Health check failed: HTTP {response.status}")
+        return await self._get_json("/health", "Health check")
     
     async def get_server_info(self) -> Dict[str, Any]:
         """Get server information (non-MCP endpoint)"""
-        if not self.session:
-            raise RuntimeError("Not connected to server")
-        
-        async with self.session.get(f"{self.base_url}/") as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                raise ConnectionError(f"Server info failed: HTTP {response.status}")
+        return await self._get_json("/", "Server info")
 
 
 # Test the MCP HTTP client
@@ -241,4 +373,4 @@ async def test_mcp_client():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_mcp_client())
+    event_loop.run(test_mcp_client())
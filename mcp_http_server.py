@@ -11,18 +11,275 @@ This maintains ALL MCP benefits while using HTTP transport:
 Búvár-style architecture with dependency injection and plugin system.
 """
 import asyncio
-import json
+import gzip
+import hashlib
 import logging
+import signal
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from aiohttp import web, web_request
-from aiohttp.web import Application, Request, Response, json_response
+from aiohttp.web import Application, Request, Response
+from multidict import CIMultiDict
 
+try:
+    import msgpack  # Optional: application/msgpack request/response bodies
+except ImportError:
+    msgpack = None
+
+try:
+    import fastjsonschema  # Optional: compiled tools/call argument validation
+except ImportError:
+    fastjsonschema = None
+
+import event_loop
+import json_codec
+from base_tool import ToolError
 from plugin_manager import PluginManager
 
 
+# Constant JSON-RPC envelope fragments - only id and result/error are
+# encoded per response
+_RPC_PREFIX = b'{"jsonrpc":"2.0","id":'
+_RESULT_SEP = b',"result":'
+_ERROR_SEP = b',"error":'
+
+# Error responses that carry no request id are constant
+_PARSE_ERROR_BODY = b'{"jsonrpc":"2.0","id":null,"error":{"code":-32700,"message":"Parse error"}}'
+_INVALID_REQUEST_BODY = b'{"jsonrpc":"2.0","id":null,"error":{"code":-32600,"message":"Invalid Request"}}'
+
+_MSGPACK_TYPE = "application/msgpack"
+
+# Upper bound on memoized tools/call results
+_CALL_CACHE_SIZE = 1024
+
+# Bodies smaller than this are sent uncompressed
+_COMPRESS_MIN_SIZE = 1024
+
+
+def _json_body_response(request: Request, body: bytes, gzip_body: Optional[bytes] = None,
+                        content_type: str = "application/json") -> Response:
+    """JSON response, compressed when large and the client accepts it
+    
+    gzip_body is an optional pre-compressed copy of body for cached payloads,
+    so they are not recompressed on every request.
+    """
+    if len(body) < _COMPRESS_MIN_SIZE:
+        return Response(body=body, content_type=content_type)
+    
+    if gzip_body is not None and "gzip" in request.headers.get("Accept-Encoding", ""):
+        return Response(
+            body=gzip_body,
+            content_type=content_type,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    
+    response = Response(body=body, content_type=content_type)
+    response.enable_compression()  # Negotiated from Accept-Encoding
+    return response
+
+
+def _error(code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    """JSON-RPC error object"""
+    error = {"code": code, "message": message}
+    if data:
+        error["data"] = data
+    return error
+
+
+def _validation_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """input_schema with the "nullable" flag rewritten as a JSON Schema type union"""
+    properties = {}
+    for name, prop in schema.get("properties", {}).items():
+        prop = dict(prop)
+        if prop.pop("nullable", False) and "type" in prop:
+            prop["type"] = [prop["type"], "null"]
+        properties[name] = prop
+    return {**schema, "properties": properties}
+
+
+def _message_id(message: Any) -> Any:
+    """Request id of a possibly malformed JSON-RPC message"""
+    return message.get("id") if isinstance(message, dict) else None
+
+
+def _envelope(request_id: Any, result: Any = None, error: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """JSON-RPC response envelope as a dict (for non-JSON wire formats)"""
+    if error is not None:
+        return {"jsonrpc": "2.0", "id": request_id, "error": error}
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+# Limits for the fast /mcp protocol (body limit matches aiohttp's default)
+_MAX_HEADER_SIZE = 8 * 1024
+_MAX_BODY_SIZE = 1024 ** 2
+
+
+def _http_response(status: bytes, body: bytes = b"", keep_alive: bool = True) -> bytes:
+    """Raw HTTP/1.1 response bytes for the fast /mcp protocol"""
+    if status.startswith(b"204"):
+        head = b"HTTP/1.1 204 No Content\r\n"
+    else:
+        head = b"HTTP/1.1 %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n" % (
+            status, len(body)
+        )
+    if not keep_alive:
+        head += b"Connection: close\r\n"
+    return head + b"\r\n" + body
+
+
+# Marks a queued fast-path request whose body failed to decode
+_PARSE_ERROR = object()
+
+
+class _FastRequest(dict):
+    """Minimal stand-in for aiohttp's Request on the fast /mcp path"""
+    
+    __slots__ = ("remote", "headers")
+    
+    def __init__(self, remote: Optional[str], headers: CIMultiDict):
+        super().__init__()
+        self.remote = remote
+        self.headers = headers
+
+
+class _FastMCPProtocol(asyncio.Protocol):
+    """
+    Bare HTTP/1.1 server for POST /mcp only, skipping aiohttp's routing and
+    Response objects on the hot path.
+    
+    Bodies must carry Content-Length (chunked uploads are rejected) and are
+    not compressed. Pipelined requests are answered in order. /health, /
+    and /tools stay on the aiohttp app.
+    """
+    
+    def __init__(self, server: "MCPOverHTTPServer"):
+        self._server = server
+        self._transport: Optional[asyncio.Transport] = None
+        self._remote: Optional[str] = None
+        self._buffer = bytearray()
+        self._tail: Optional[asyncio.Future] = None  # Last queued response
+        self._continue_sent = False  # 100 Continue sent for the pending request
+    
+    def connection_made(self, transport: asyncio.Transport):
+        self._transport = transport
+        peer = transport.get_extra_info("peername")
+        self._remote = peer[0] if peer else None
+    
+    def connection_lost(self, exc: Optional[Exception]):
+        self._transport = None
+    
+    def data_received(self, data: bytes):
+        self._buffer += data
+        while self._transport is not None:
+            head_end = self._buffer.find(b"\r\n\r\n")
+            if head_end < 0:
+                if len(self._buffer) > _MAX_HEADER_SIZE:
+                    self._reject(b"431 Request Header Fields Too Large")
+                return
+            
+            try:
+                request_line, *header_lines = self._buffer[:head_end].decode("latin-1").split("\r\n")
+                method, path, version = request_line.split(" ", 2)
+            except ValueError:
+                self._reject(b"400 Bad Request")
+                return
+            
+            if method != "POST" or path.partition("?")[0] != "/mcp":
+                self._reject(b"404 Not Found")
+                return
+            
+            headers = CIMultiDict()
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                headers.add(name.strip(), value.strip())
+            
+            if "chunked" in headers.get("Transfer-Encoding", "").lower():
+                self._reject(b"501 Not Implemented")
+                return
+            try:
+                length = int(headers.get("Content-Length", ""))
+            except ValueError:
+                self._reject(b"411 Length Required")
+                return
+            if length < 0:
+                self._reject(b"400 Bad Request")
+                return
+            if length > _MAX_BODY_SIZE:
+                self._reject(b"413 Payload Too Large")
+                return
+            
+            expect = headers.get("Expect", "").lower()
+            if expect and expect != "100-continue":
+                self._reject(b"417 Expectation Failed")
+                return
+            
+            body_start = head_end + 4
+            if len(self._buffer) < body_start + length:
+                if expect and not self._continue_sent:
+                    # Client waits for this before sending the body
+                    self._transport.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                    self._continue_sent = True
+                return  # Wait for the rest of the body
+            
+            body = bytes(self._buffer[body_start:body_start + length])
+            del self._buffer[:body_start + length]
+            self._continue_sent = False
+            
+            keep_alive = (
+                version == "HTTP/1.1" and headers.get("Connection", "").lower() != "close"
+            )
+            try:
+                data = json_codec.loads(body)
+            except json_codec.JSONDecodeError:
+                if self._tail is None or self._tail.done():
+                    # Nothing queued ahead: answer inline, no task needed
+                    self._write(_http_response(b"200 OK", _PARSE_ERROR_BODY, keep_alive), keep_alive)
+                    continue
+                data = _PARSE_ERROR
+            
+            request = _FastRequest(self._remote, headers)
+            self._tail = asyncio.ensure_future(
+                self._respond(self._tail, data, request, keep_alive)
+            )
+    
+    async def _respond(self, previous: Optional[asyncio.Future], data: Any,
+                       request: _FastRequest, keep_alive: bool):
+        """Dispatch one request and write its response after the previous one"""
+        if previous is not None:
+            await previous
+        
+        try:
+            if data is _PARSE_ERROR:
+                payload = _PARSE_ERROR_BODY
+            else:
+                payload = await self._server._process_data(data, request)
+        except Exception as e:
+            self._server.logger.error("Error handling MCP request: %s", e)
+            payload, status = b"", b"500 Internal Server Error"
+        else:
+            status = b"200 OK" if payload is not None else b"204 No Content"
+        
+        self._write(_http_response(status, payload or b"", keep_alive), keep_alive)
+    
+    def _write(self, response: bytes, keep_alive: bool):
+        """Write a complete response; responses are small, so no drain"""
+        if self._transport is None:
+            return  # Client went away
+        self._transport.write(response)
+        if not keep_alive:
+            self._transport.close()
+            self._transport = None
+    
+    def _reject(self, status: bytes):
+        """Answer a request the fast path can't serve and drop the connection"""
+        self._buffer.clear()
+        self._write(_http_response(status, keep_alive=False), keep_alive=False)
+
+
 class MCPOverHTTPServer:
     """
     Proper MCP server using JSON-RPC 2.0 over HTTP transport
@@ -30,10 +287,20 @@ class MCPOverHTTPServer:
     Maintains full MCP protocol compliance while using HTTP for transport.
     """
     
-    def __init__(self, plugin_manager: PluginManager, host: str = "localhost", port: int = 8081):
+    def __init__(
+        self,
+        plugin_manager: PluginManager,
+        host: str = "localhost",
+        port: int = 8081,
+        cache_ttl_seconds: float = 300,
+        max_sessions: int = 10_000,
+        fast_port: Optional[int] = None,
+    ):
         self.plugin_manager = plugin_manager
         self.host = host
         self.port = port
+        # Optional second port serving POST /mcp through _FastMCPProtocol
+        self.fast_port = fast_port
         
         # MCP protocol state
         self.protocol_version = "2024-11-05"
@@ -45,22 +312,71 @@ class MCPOverHTTPServer:
             "tools": {}  # We support tools
         }
         
-        # Client sessions (for multi-client support)
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+        # Client sessions (for multi-client support), least recently used
+        # first; the oldest is evicted once max_sessions is exceeded
+        self.sessions: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self.max_sessions = max_sessions
+        
+        # tools/list cache - dropped when the plugin manager reloads tools,
+        # and refreshed after cache_ttl_seconds as a safety net
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._tools_cache: Optional[Dict[str, Any]] = None
+        self._tools_cache_body: Optional[bytes] = None
+        self._tools_cache_gzip: Optional[bytes] = None
+        self._tools_cache_time = 0.0
+        plugin_manager.register_change_callback(self._invalidate_tools_cache)
+        
+        # tools/call argument validators for tools that set validate_arguments;
+        # compiled in start() and again on first use after the tool set changes
+        self._validators: Dict[str, Callable[[Any], Any]] = {}
+        self._validators_stale = True
+        plugin_manager.register_change_callback(self._invalidate_validators)
+        
+        # Results of cacheable (deterministic) tools: key -> (expires_at, result)
+        self._call_cache: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        
+        # Immutable metadata encoded once; /health only splices in counters
+        self._health_prefix = json_codec.dumps({
+            "status": "healthy",
+            "server": self.server_info,
+            "protocol": "MCP over HTTP (JSON-RPC 2.0)",
+        })[:-1] + b',"sessions":'
+        self._info_body = json_codec.dumps(self._build_info())
         
+        self._shutdown: Optional[asyncio.Event] = None
         self.logger = logging.getLogger("mcp_http_server")
         
     async def start(self):
         """Start the MCP-over-HTTP server"""
         # Load tools BEFORE starting server to avoid race condition
         self.logger.info("📦 Loading tools...")
-        await self.plugin_manager.discover_and_load_tools()
+        await self.plugin_manager.ensure_loaded()
+        self._compile_validators()
         tool_count = len(self.plugin_manager.loaded_tools)
-        self.logger.info(f"🔧 Loaded {tool_count} tools")
+        self.logger.info("🔧 Loaded %d tools", tool_count)
         
         if tool_count == 0:
             self.logger.warning("⚠️  No tools loaded! Check tools directory")
         
+        # Park on an event instead of polling; SIGINT/SIGTERM set it
+        self._shutdown = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        installed_signals = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.request_shutdown)
+                installed_signals.append(sig)
+            except (NotImplementedError, RuntimeError):
+                pass  # No signal handlers on Windows / non-main thread
+        
+        try:
+            await self._serve_until_shutdown(loop, tool_count)
+        finally:
+            for sig in installed_signals:
+                loop.remove_signal_handler(sig)
+    
+    async def _serve_until_shutdown(self, loop: asyncio.AbstractEventLoop, tool_count: int):
+        """Run the aiohttp site (and fast endpoint) until the shutdown event is set"""
         # Now start the HTTP server
         app = self._create_app()
         
@@ -70,18 +386,32 @@ class MCPOverHTTPServer:
         site = web.TCPSite(runner, self.host, self.port)
         await site.start()
         
-        self.logger.info(f"🎯 MCP-over-HTTP Server started on http://{self.host}:{self.port}")
-        self.logger.info(f"📋 Protocol: JSON-RPC 2.0 (proper MCP)")
-        self.logger.info(f"🔧 Tools available: {tool_count}")
+        fast_server = None
+        if self.fast_port is not None:
+            fast_server = await loop.create_server(
+                lambda: _FastMCPProtocol(self), self.host, self.fast_port
+            )
+            self.logger.info("⚡ Fast MCP endpoint on http://%s:%s/mcp", self.host, self.fast_port)
+        
+        self.logger.info("🎯 MCP-over-HTTP Server started on http://%s:%s", self.host, self.port)
+        self.logger.info("📋 Protocol: JSON-RPC 2.0 (proper MCP)")
+        self.logger.info("🔧 Tools available: %d", tool_count)
         
         # Keep running
         try:
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
+            await self._shutdown.wait()
             self.logger.info("Server shutting down...")
+        finally:
+            if fast_server is not None:
+                fast_server.close()
+                await fast_server.wait_closed()
             await runner.cleanup()
     
+    def request_shutdown(self):
+        """Ask a running start() to stop and clean up"""
+        if self._shutdown is not None:
+            self._shutdown.set()
+    
     def _create_app(self) -> Application:
         """Create aiohttp application with MCP routes"""
         app = web.Application()
@@ -101,21 +431,125 @@ class MCPOverHTTPServer:
         return app
     
     async def _handle_mcp_request(self, request: Request) -> Response:
-        """Handle JSON-RPC 2.0 MCP requests"""
+        """Handle JSON-RPC 2.0 MCP requests (single or batch)"""
+        content_type = request.content_type
+        if content_type == _MSGPACK_TYPE:
+            if msgpack is None:
+                return Response(status=415, text="msgpack is not installed on this server")
+            body = await self._process_msgpack(await request.read(), request)
+        else:
+            content_type = "application/json"
+            body = await self._process_payload(await request.read(), request)
+        
+        if body is None:  # Notification (no response)
+            return Response(status=204)  # No Content
+        return _json_body_response(request, body, content_type=content_type)
+    
+    async def _process_payload(self, raw: bytes, request: Any) -> Optional[bytes]:
+        """Decode and dispatch a /mcp body, returning the encoded response or None
+        
+        Shared by the aiohttp handler and the fast /mcp protocol; request only
+        needs .remote, .headers and item assignment.
+        """
         try:
             # Parse JSON-RPC request
-            data = await request.json()
-            
-            # Validate JSON-RPC format
-            if not self._is_valid_jsonrpc(data):
-                return self._jsonrpc_error(None, -32600, "Invalid Request")
-            
-            method = data["method"]
-            params = data.get("params", {})
-            request_id = data.get("id")
-            
-            self.logger.debug(f"MCP Request: {method}")
-            
+            data = json_codec.loads(raw)
+        except json_codec.JSONDecodeError:
+            return _PARSE_ERROR_BODY
+        
+        return await self._process_data(data, request)
+    
+    async def _process_data(self, data: Any, request: Any) -> Optional[bytes]:
+        """Dispatch an already decoded /mcp body (single message or batch)"""
+        # Resolve the client session once; handlers read request["session"]
+        request["session"] = self._get_session(request)
+        
+        if isinstance(data, list):
+            return await self._process_batch(data, request)
+        return await self._process_message(data, request)
+    
+    async def _process_batch(self, batch: List[Any], request: Any) -> Optional[bytes]:
+        """Handle a JSON-RPC 2.0 batch - N calls answered in one round-trip"""
+        if not batch:
+            return _INVALID_REQUEST_BODY
+        
+        # Entries run concurrently; an unexpected failure in one becomes
+        # that entry's error instead of failing the batch
+        outcomes = await asyncio.gather(
+            *(self._process_message(message, request) for message in batch),
+            return_exceptions=True,
+        )
+        bodies = []
+        for message, body in zip(batch, outcomes):
+            if isinstance(body, Exception):
+                self.logger.error("Error handling MCP batch entry: %s", body)
+                body = self._encode_error(_message_id(message), -32603, f"Internal error: {body}")
+            if body is not None:
+                bodies.append(body)
+        if not bodies:  # Batch of notifications only
+            return None
+        
+        return b"[" + b",".join(bodies) + b"]"
+    
+    async def _process_msgpack(self, raw: bytes, request: Request) -> Optional[bytes]:
+        """msgpack counterpart of _process_payload - same JSON-RPC envelopes"""
+        try:
+            data = msgpack.unpackb(raw, raw=False)
+        except (ValueError, msgpack.UnpackException):
+            return msgpack.packb(_envelope(None, error=_error(-32700, "Parse error")))
+        
+        request["session"] = self._get_session(request)
+        
+        messages = data if isinstance(data, list) else [data]
+        if not messages:
+            return msgpack.packb(_envelope(None, error=_error(-32600, "Invalid Request")))
+        
+        outcomes = await asyncio.gather(
+            *(self._dispatch(message, request) for message in messages),
+            return_exceptions=True,
+        )
+        responses = []
+        for message, outcome in zip(messages, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error("Error handling MCP batch entry: %s", outcome)
+                outcome = (_message_id(message), None, _error(-32603, f"Internal error: {outcome}"))
+            request_id, result, error = outcome
+            if error is not None or request_id is not None:
+                responses.append(_envelope(request_id, result, error))
+        if not responses:  # Notifications only
+            return None
+        
+        return msgpack.packb(responses if isinstance(data, list) else responses[0])
+    
+    async def _process_message(self, data: Any, request: Any) -> Optional[bytes]:
+        """Dispatch one JSON-RPC message, returning the encoded response or None for notifications"""
+        if not self._is_valid_jsonrpc(data):
+            return _INVALID_REQUEST_BODY
+        
+        request_id, result, error = await self._dispatch(data, request)
+        if error is not None:
+            return self._encode_error(request_id, **error)
+        if request_id is None:  # Notification
+            return None
+        try:
+            return self._encode_success(request_id, result)
+        except Exception as e:
+            self.logger.error("Error encoding MCP response: %s", e)
+            return self._encode_error(request_id, -32603, f"Internal error: {str(e)}")
+    
+    async def _dispatch(self, data: Any, request: Any) -> Tuple[Any, Any, Optional[Dict[str, Any]]]:
+        """Run one JSON-RPC message, returning (request_id, result, error)"""
+        # Validate JSON-RPC format
+        if not self._is_valid_jsonrpc(data):
+            return None, None, _error(-32600, "Invalid Request")
+        
+        method = data["method"]
+        params = data.get("params", {})
+        request_id = data.get("id")
+        
+        self.logger.debug("MCP Request: %s", method)
+        
+        try:
             # Route to MCP method handlers
             if method == "initialize":
                 result = await self._handle_initialize(params, request)
@@ -126,20 +560,14 @@ class MCPOverHTTPServer:
             elif method == "tools/call":
                 result = await self._handle_tools_call(params, request)
             else:
-                return self._jsonrpc_error(request_id, -32601, f"Method not found: {method}")
-            
-            # Return JSON-RPC response
-            if request_id is not None:  # Request (not notification)
-                return self._jsonrpc_success(request_id, result)
-            else:  # Notification (no response)
-                return Response(status=204)  # No Content
-                
-        except json.JSONDecodeError:
-            return self._jsonrpc_error(None, -32700, "Parse error")
+                return request_id, None, _error(-32601, f"Method not found: {method}")
+        except ToolError as e:
+            return request_id, None, _error(e.code, e.message)
         except Exception as e:
-            self.logger.error(f"Error handling MCP request: {e}")
-            request_id = data.get("id") if 'data' in locals() else None
-            return self._jsonrpc_error(request_id, -32603, f"Internal error: {str(e)}")
+            self.logger.error("Error handling MCP request: %s", e)
+            return request_id, None, _error(-32603, f"Internal error: {str(e)}")
+        
+        return request_id, result, None
     
     def _is_valid_jsonrpc(self, data: Dict[str, Any]) -> bool:
         """Validate JSON-RPC 2.0 format"""
@@ -149,49 +577,49 @@ class MCPOverHTTPServer:
             isinstance(data["method"], str)
         )
     
-    def _jsonrpc_success(self, request_id: Any, result: Any) -> Response:
-        """Create JSON-RPC success response"""
-        response_data = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": result
-        }
-        return json_response(response_data)
+    def _encode_success(self, request_id: Any, result: Any) -> bytes:
+        """Encode JSON-RPC success response"""
+        return b"".join((
+            _RPC_PREFIX, json_codec.dumps(request_id),
+            _RESULT_SEP, json_codec.dumps(result), b"}"
+        ))
     
-    def _jsonrpc_error(self, request_id: Any, code: int, message: str, data: Any = None) -> Response:
-        """Create JSON-RPC error response"""
-        error = {"code": code, "message": message}
-        if data:
-            error["data"] = data
-            
-        response_data = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "error": error
-        }
-        return json_response(response_data, status=200)  # JSON-RPC errors use 200 OK
+    def _encode_error(self, request_id: Any, code: int, message: str, data: Any = None) -> bytes:
+        """Encode JSON-RPC error response"""
+        return b"".join((
+            _RPC_PREFIX, json_codec.dumps(request_id),
+            _ERROR_SEP, json_codec.dumps(_error(code, message, data)), b"}"
+        ))
     
-    def _get_session_id(self, request: Request) -> str:
-        """Get or create session ID for client"""
-        # Use client IP + User-Agent as session key
-        client_ip = request.remote
+    def _get_session(self, request: Request) -> Dict[str, Any]:
+        """Get or create the session for a client"""
+        # Use client IP + User-Agent as session key, digested to a fixed
+        # 16 bytes so long or hostile User-Agent strings aren't kept around
+        client_ip = request.remote or ""
         user_agent = request.headers.get("User-Agent", "unknown")
-        session_key = f"{client_ip}_{hash(user_agent)}"
-        
-        if session_key not in self.sessions:
-            self.sessions[session_key] = {
-                "id": session_key,
-                "initialized": False,
-                "created_at": datetime.now(),
-                "client_info": {}
-            }
+        session_key = hashlib.blake2b(
+            user_agent.encode(), digest_size=16, key=client_ip.encode()
+        ).digest()
+        
+        session = self.sessions.get(session_key)
+        if session is not None:
+            self.sessions.move_to_end(session_key)
+            return session
+        
+        session = self.sessions[session_key] = {
+            "id": session_key.hex(),
+            "initialized": False,
+            "created_at": datetime.now(),
+            "client_info": {}
+        }
+        if len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
         
-        return session_key
+        return session
     
     async def _handle_initialize(self, params: Dict[str, Any], request: Request) -> Dict[str, Any]:
         """Handle MCP initialize request"""
-        session_id = self._get_session_id(request)
-        session = self.sessions[session_id]
+        session = request["session"]
         
         # Validate protocol version
         client_version = params.get("protocolVersion")
@@ -202,7 +630,7 @@ class MCPOverHTTPServer:
         session["client_info"] = params.get("clientInfo", {})
         session["protocol_version"] = client_version
         
-        self.logger.info(f"Client initializing: {session['client_info'].get('name', 'unknown')}")
+        self.logger.info("Client initializing: %s", session["client_info"].get("name", "unknown"))
         
         # Return server capabilities
         return {
@@ -213,19 +641,17 @@ class MCPOverHTTPServer:
     
     async def _handle_initialized(self, params: Dict[str, Any], request: Request) -> None:
         """Handle initialized notification"""
-        session_id = self._get_session_id(request)
-        session = self.sessions[session_id]
+        session = request["session"]
         session["initialized"] = True
         
         client_name = session["client_info"].get("name", "unknown")
-        self.logger.info(f"Client '{client_name}' initialization complete")
+        self.logger.info("Client '%s' initialization complete", client_name)
         
         return None  # Notification - no result
     
     async def _handle_tools_list_mcp(self, params: Dict[str, Any], request: Request) -> Dict[str, Any]:
         """Handle MCP tools/list request"""
-        session_id = self._get_session_id(request)
-        session = self.sessions[session_id]
+        session = request["session"]
         
         if not session.get("initialized"):
             raise ValueError("Server not initialized")
@@ -235,24 +661,58 @@ class MCPOverHTTPServer:
             self.logger.warning("No tools loaded, attempting to reload...")
             await self.plugin_manager.discover_and_load_tools()
         
-        # Get tools from plugin manager
-        tools_list = []
-        for tool_name, tool_instance in self.plugin_manager.loaded_tools.items():
-            tool_info = {
-                "name": tool_name,
-                "description": tool_instance.description,
-                "inputSchema": tool_instance.input_schema
-            }
-            tools_list.append(tool_info)
+        result = self._get_tools_result()
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Returning %d tools to client", len(result["tools"]))
         
-        self.logger.debug(f"Returning {len(tools_list)} tools to client")
+        return result
+    
+    def _get_tools_result(self) -> Dict[str, Any]:
+        """Cached {"tools": [...]} result, rebuilt on reload or TTL expiry"""
+        now = time.monotonic()
+        if self._tools_cache is None or now - self._tools_cache_time > self.cache_ttl_seconds:
+            # Per-tool entries are built once per discovery by the plugin manager
+            tools_list = list(self.plugin_manager.get_tool_registry().values())
+            self._tools_cache = {"tools": tools_list}
+            self._tools_cache_body = json_codec.dumps(self._tools_cache)
+            self._tools_cache_gzip = gzip.compress(self._tools_cache_body)
+            self._tools_cache_time = now
+        return self._tools_cache
+    
+    def _invalidate_tools_cache(self) -> None:
+        """Plugin manager change callback - drop the cached tools/list and re-encode /"""
+        self._tools_cache = None
+        self._tools_cache_body = None
+        self._tools_cache_gzip = None
+        self._info_body = json_codec.dumps(self._build_info())
+        self._call_cache.clear()
+    
+    def _invalidate_validators(self) -> None:
+        """Plugin manager change callback - recompile validators on next use"""
+        self._validators_stale = True
+    
+    def _compile_validators(self) -> None:
+        """Compile the input schema of each tool that opts into validation"""
+        self._validators.clear()
+        self._validators_stale = False
+        if fastjsonschema is None:
+            return
         
-        return {"tools": tools_list}
+        for tool_name, tool_instance in self.plugin_manager.loaded_tools.items():
+            # Generated schemas only approximate what a tool accepts, so
+            # validation is opt-in rather than applied to every tool
+            if not getattr(tool_instance, "validate_arguments", False):
+                continue
+            try:
+                self._validators[tool_name] = fastjsonschema.compile(
+                    _validation_schema(tool_instance.input_schema)
+                )
+            except fastjsonschema.JsonSchemaDefinitionException as e:
+                self.logger.warning("Skipping argument validation for %s: %s", tool_name, e)
     
     async def _handle_tools_call(self, params: Dict[str, Any], request: Request) -> Dict[str, Any]:
         """Handle MCP tools/call request"""
-        session_id = self._get_session_id(request)
-        session = self.sessions[session_id]
+        session = request["session"]
         
         if not session.get("initialized"):
             raise ValueError("Server not initialized")
@@ -268,30 +728,58 @@ class MCPOverHTTPServer:
         if not tool_instance:
             raise ValueError(f"Tool not found: {tool_name}")
         
-        self.logger.info(f"Executing tool: {tool_name}")
+        if self._validators_stale:
+            self._compile_validators()
+        validator = self._validators.get(tool_name)
+        if validator is not None:
+            try:
+                validator(arguments)
+            except fastjsonschema.JsonSchemaException as e:
+                raise ToolError(f"Invalid params: {e.message}", code=-32602)
+        
+        cache_key = None
+        if getattr(tool_instance, "cacheable", False):
+            cache_key = hashlib.blake2b(
+                json_codec.dumps_canonical([tool_name, arguments]), digest_size=16
+            ).digest()
+            cached = self._call_cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._call_cache.move_to_end(cache_key)
+                self.logger.debug("Cache hit for tool: %s", tool_name)
+                return cached[1]
+        
+        self.logger.info("Executing tool: %s", tool_name)
         
         try:
             # Execute tool using plugin manager
             result = await self.plugin_manager.execute_tool(tool_name, arguments)
-            return result
             
         except Exception as e:
-            self.logger.error(f"Tool execution failed: {e}")
+            self.logger.error("Tool execution failed: %s", e)
             raise ValueError(f"Tool execution error: {str(e)}")
+        
+        if cache_key is not None:
+            self._call_cache[cache_key] = (time.monotonic() + tool_instance.cache_ttl, result)
+            self._call_cache.move_to_end(cache_key)
+            if len(self._call_cache) > _CALL_CACHE_SIZE:
+                self._call_cache.popitem(last=False)
+        
+        return result
     
     async def _handle_health(self, request: Request) -> Response:
         """Health check endpoint (non-MCP)"""
-        return json_response({
-            "status": "healthy",
-            "server": self.server_info,
-            "protocol": "MCP over HTTP (JSON-RPC 2.0)",
-            "sessions": len(self.sessions),
-            "tools": len(self.plugin_manager.loaded_tools)
-        })
+        body = b"%s%d,\"tools\":%d}" % (
+            self._health_prefix, len(self.sessions), len(self.plugin_manager.loaded_tools)
+        )
+        return Response(body=body, content_type="application/json")
     
     async def _handle_info(self, request: Request) -> Response:
         """Server information endpoint (non-MCP)"""
-        return json_response({
+        return _json_body_response(request, self._info_body)
+    
+    def _build_info(self) -> Dict[str, Any]:
+        """Server information payload - constant until tools are reloaded"""
+        return {
             "server": self.server_info,
             "protocol": {
                 "name": "Model Context Protocol",
@@ -309,19 +797,12 @@ class MCPOverHTTPServer:
                 "count": len(self.plugin_manager.loaded_tools),
                 "available": list(self.plugin_manager.loaded_tools.keys())
             }
-        })
+        }
     
     async def _handle_tools_list(self, request: Request) -> Response:
         """Quick tools listing (non-MCP, for debugging)"""
-        tools = []
-        for tool_name, tool_instance in self.plugin_manager.loaded_tools.items():
-            tools.append({
-                "name": tool_name,
-                "description": tool_instance.description,
-                "inputSchema": tool_instance.input_schema
-            })
-        
-        return json_response({"tools": tools})
+        self._get_tools_result()
+        return _json_body_response(request, self._tools_cache_body, self._tools_cache_gzip)
 
 
 async def main():
@@ -332,7 +813,7 @@ async def main():
     )
     
     # Create plugin manager and server
-    plugin_manager = PluginManager("tools")
+    plugin_manager = PluginManager.shared("tools")
     server = MCPOverHTTPServer(plugin_manager, host="localhost", port=8081)
     
     print("🎯 Starting MCP-over-HTTP Server (JSON-RPC 2.0)")
@@ -352,4 +833,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    event_loop.run(main())
@@ -8,17 +8,81 @@ Automatically discovers and loads MCP tools from multiple sources:
 - @mcp_tool class decorators
 - @tool_method method decorators
 """
+import asyncio
 import os
 import sys
-import importlib
+import importlib.abc
 import importlib.util
+import inspect
 import logging
-from typing import Dict, List, Type, Any
+import pkgutil
+from functools import cache
+from importlib.machinery import ModuleSpec
+from operator import attrgetter
+from types import CodeType, ModuleType
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Type
 from pathlib import Path
-from functools import lru_cache
 
-from base_tool import BaseTool, ToolError
-from tool_decorators import get_decorator_tools, register_tools_from_module
+from base_tool import BaseTool, ToolError, get_tool_classes
+from tool_decorators import get_decorator_tools, register_decorator_tools, register_tools_from_module
+
+logger = logging.getLogger(__name__)
+
+
+# PluginManager.shared() instances by resolved tools directory
+_shared_managers: Dict[str, "PluginManager"] = {}
+
+# sys.path entries already ensured by a PluginManager (skips the list scan)
+_paths_added: Set[str] = set()
+
+# Plugin file name prefixes that are never loaded (covers __init__.py)
+_SKIPPED_PREFIXES = (".", "_", "#")
+
+
+class PluginFile(NamedTuple):
+    """A plugin file found by discovery, with its names and mtime read once"""
+    path: Path
+    stem: str
+    name: str
+    mtime_ns: int
+    spec: Optional[ModuleSpec] = None
+    
+    @classmethod
+    def from_path(cls, path: Path) -> "PluginFile":
+        """Describe a plugin file outside discovery (for loading it directly)"""
+        return cls(path, path.stem, path.name, path.stat().st_mtime_ns)
+
+
+@cache
+def _execute_kind(tool_class: type) -> Tuple[bool, bool]:
+    """(is coroutine function, is async generator function) for a tool class's execute"""
+    return asyncio.iscoroutinefunction(tool_class.execute), inspect.isasyncgenfunction(tool_class.execute)
+
+
+@cache
+def _result_adapter(result_type: type) -> Optional[Callable[[Any], Dict[str, Any]]]:
+    """The to_dict function for a tool result class (None if it has none)"""
+    return getattr(result_type, "to_dict", None)
+
+
+class ToolEntry:
+    """Per-tool data resolved once at registration (slot access, no instance dict)"""
+    
+    __slots__ = ("name", "description", "schema", "execute", "stream", "kind", "mcp_entry", "tool")
+    
+    def __init__(self, tool: BaseTool):
+        self.name = tool.name
+        self.description = tool.description
+        self.schema = tool.input_schema
+        self.execute = tool.execute
+        self.stream = tool.stream
+        self.kind = "decorator" if hasattr(tool, '_func') else "traditional"
+        self.mcp_entry = {
+            "name": self.name,
+            "description": self.description,
+            "inputSchema": self.schema
+        }
+        self.tool = tool
 
 
 class PluginManager:
@@ -35,8 +99,50 @@ class PluginManager:
     
     def __init__(self, tools_directory: str = "tools"):
         self.tools_directory = Path(tools_directory)
+        # The tools directory does not move; resolve its paths once
+        self._tools_abs = str(self.tools_directory.resolve())
+        self._tools_parent = str(self.tools_directory.resolve().parent)
         self.loaded_tools: Dict[str, BaseTool] = {}
         self.failed_plugins: List[str] = []
+        self._change_callbacks: List[Callable[[], None]] = []
+        # tools/list entries, built once per tool as it is registered
+        self._registry: Dict[str, Dict[str, Any]] = {}
+        # Registration-time snapshot of each tool; the call paths read these
+        self._entries: Dict[str, ToolEntry] = {}
+        # Hot-path dispatch table: name -> (bound execute, streams)
+        self._dispatch: Dict[str, Tuple[Callable[..., Any], bool]] = {}
+        # Tool names per kind ("traditional"/"decorator"), classified once
+        self._tools_by_kind: Dict[str, List[str]] = {"traditional": [], "decorator": []}
+        # plugin file -> (st_mtime_ns, module, decorator tools it registered);
+        # unchanged files are not re-executed on rediscovery
+        self._module_cache: Dict[Path, Tuple[int, ModuleType, Dict[str, BaseTool]]] = {}
+        # Set by the first ensure_loaded(); servers sharing this manager reuse its tools
+        self._loaded = False
+        self._load_lock: Optional[asyncio.Lock] = None
+    
+    @classmethod
+    def shared(cls, tools_directory: str = "tools") -> "PluginManager":
+        """The process-wide manager for a tools directory (created on first use)
+        
+        Launchers use this so several transports in one process discover and
+        import the plugins only once.
+        """
+        key = str(Path(tools_directory).resolve())
+        manager = _shared_managers.get(key)
+        if manager is None:
+            manager = _shared_managers[key] = cls(tools_directory)
+        return manager
+    
+    async def ensure_loaded(self) -> Dict[str, BaseTool]:
+        """Discover tools unless this manager already has; returns the loaded tools"""
+        if self._loaded:
+            return self.loaded_tools
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if not self._loaded:
+                await self.discover_and_load_tools()
+        return self.loaded_tools
         
     async def discover_and_load_tools(self) -> Dict[str, BaseTool]:
         """
@@ -51,59 +157,193 @@ class PluginManager:
         Returns:
             Dictionary mapping tool names to tool instances
         """
-        logging.info(f"🔍 Discovering tools in {self.tools_directory}")
+        async for _ in self.iter_tools():
+            pass
+        self._loaded = True
+        return self.loaded_tools
+    
+    async def iter_tools(self) -> AsyncIterator[Tuple[str, BaseTool]]:
+        """Discover and load tools, yielding (name, tool) as each plugin finishes
+        
+        Plugin files are imported concurrently but registered one by one in
+        sorted file order, so tool order and name-conflict resolution do not
+        depend on thread timing; each step is visible to the registry (and
+        change callbacks) immediately.
+        """
+        logger.info("🔍 Discovering tools in %s", self.tools_directory)
         
         if not self.tools_directory.exists():
-            logging.warning(f"Tools directory {self.tools_directory} not found")
-            return {}
+            logger.warning("Tools directory %s not found", self.tools_directory)
+            return
         
         # Ensure tools directory is in Python path
-        tools_path = str(self.tools_directory.absolute())
-        if tools_path not in sys.path:
-            sys.path.insert(0, str(self.tools_directory.parent))
+        tools_path = self._tools_abs
+        parent = self._tools_parent
+        if parent not in _paths_added:
+            if parent not in sys.path:
+                sys.path.insert(0, parent)
+            _paths_added.add(parent)
         
         # Clear decorator registry to start fresh
         from tool_decorators import clear_decorator_registry
         clear_decorator_registry()
         
-        # Load all Python files in tools directory
-        python_files = list(self.tools_directory.glob("*.py"))
-        python_files = [f for f in python_files if f.name != "__init__.py"]
+        # Load all Python files in tools directory, resolving specs through
+        # the shared (cached) path entry finder instead of one per file
+        # (single scandir pass; hidden, editor-backup and _private files skipped)
+        finder = pkgutil.get_importer(tools_path)
+        # (the entry's stat also provides the mtime for the module cache)
+        plugin_files = []
+        with os.scandir(tools_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith(".py") or name.startswith(_SKIPPED_PREFIXES):
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stem = name[:-3]
+                spec = finder.find_spec(f"tools.{stem}")
+                if spec and spec.origin:
+                    mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+                    plugin_files.append(PluginFile(Path(spec.origin), stem, name, mtime, spec))
         
-        logging.info(f"📦 Found {len(python_files)} potential plugin files")
+        plugin_files.sort(key=attrgetter("name"))
+        logger.info("📦 Found %s potential plugin files", len(plugin_files))
         
-        # Load each plugin file
-        for plugin_file in python_files:
+        # Import plugin modules concurrently in worker threads (file reads and
+        # compiles overlap), then merge them into the registry in file order
+        imports = [asyncio.ensure_future(self._import_in_thread(pf)) for pf in plugin_files]
+        for imported in imports:
+            plugin_file, result = await imported
+            known = len(self.loaded_tools)
             try:
-                await self._load_plugin_file(plugin_file)
+                if isinstance(result, Exception):
+                    raise result
+                await self._load_plugin_file(plugin_file, result)
+                await self._load_decorator_tools(self._module_cache[plugin_file.path][2])
             except Exception as e:
-                logging.error(f"❌ Failed to load plugin {plugin_file.name}: {e}")
+                logger.error("❌ Failed to load plugin %s: %s", plugin_file.name, e)
                 self.failed_plugins.append(plugin_file.name)
+            
+            for item in self._loaded_since(known):
+                yield item
         
-        # Add decorator-based tools to our registry
+        # Decorator tools registered from outside the plugin files
+        known = len(self.loaded_tools)
         await self._load_decorator_tools()
+        for item in self._loaded_since(known):
+            yield item
         
-        logging.info(f"✅ Successfully loaded {len(self.loaded_tools)} tools")
+        logger.info("✅ Successfully loaded %s tools", len(self.loaded_tools))
         if self.failed_plugins:
-            logging.warning(f"⚠️  Failed to load {len(self.failed_plugins)} plugins: {self.failed_plugins}")
+            logger.warning("⚠️  Failed to load %s plugins: %s", len(self.failed_plugins), self.failed_plugins)
         
-        return self.loaded_tools
+        self._notify_change()
     
-    async def _load_plugin_file(self, plugin_file: Path) -> None:
-        """Load tools from a single plugin file"""
-        module_name = f"tools.{plugin_file.stem}"
+    async def _import_in_thread(self, plugin_file: PluginFile) -> Tuple[PluginFile, Any]:
+        """Compile a plugin in a worker thread, then import it on the loop thread
         
+        Only the file read and compile run concurrently; module code always
+        executes on one thread, so a plugin importing another plugin never
+        sees it half-initialised. Returns (file, result or exception).
+        """
         try:
-            # Import the module
-            spec = importlib.util.spec_from_file_location(module_name, plugin_file)
+            code = await asyncio.to_thread(self._compile_plugin, plugin_file)
+            return plugin_file, self._import_plugin(plugin_file, code)
+        except Exception as e:
+            return plugin_file, e
+    
+    def _compile_plugin(self, plugin_file: PluginFile) -> Optional[CodeType]:
+        """Code object for a plugin that needs executing (None if unchanged)"""
+        cached = self._module_cache.get(plugin_file.path)
+        if cached is not None and cached[0] == plugin_file.mtime_ns:
+            return None
+        spec = plugin_file.spec
+        if spec is None or not isinstance(spec.loader, importlib.abc.InspectLoader):
+            return None  # _import_plugin falls back to exec_module
+        return spec.loader.get_code(spec.name)
+    
+    def _loaded_since(self, known: int) -> List[Tuple[str, BaseTool]]:
+        """(name, tool) pairs registered after the first known tools, notifying listeners"""
+        if len(self.loaded_tools) == known:
+            return []
+        self._notify_change()
+        return list(self.loaded_tools.items())[known:]
+    
+    def register_change_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback invoked whenever the loaded tool set changes"""
+        self._change_callbacks.append(callback)
+    
+    def _notify_change(self) -> None:
+        """Notify listeners (e.g. transports caching payloads) that the tool set changed"""
+        for callback in self._change_callbacks:
+            callback()
+    
+    def _import_plugin(self, plugin_file: PluginFile,
+                       code: Optional[CodeType] = None) -> Tuple[ModuleType, bool]:
+        """Import a plugin module, returning (module, freshly_executed)
+        
+        code is the module's precompiled code (see _compile_plugin), if any.
+        Unchanged files (same mtime) reuse the module from the previous
+        discovery.
+        """
+        path, mtime, spec = plugin_file.path, plugin_file.mtime_ns, plugin_file.spec
+        cached = self._module_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], False
+        
+        module_name = spec.name if spec else f"tools.{plugin_file.stem}"
+        
+        # First sight of this file: reuse the module if something already
+        # imported it (no second exec of its side effects). A changed file
+        # (stale cache entry) is always re-executed.
+        module = sys.modules.get(module_name) if cached is None else None
+        if module is None or not self._module_from_file(module, path):
+            if spec is None:
+                spec = importlib.util.spec_from_file_location(module_name, path)
             if not spec or not spec.loader:
-                raise ImportError(f"Could not load spec for {plugin_file}")
+                raise ImportError(f"Could not load spec for {path}")
             
             module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            sys.modules[module_name] = module
+            try:
+                if code is not None:
+                    exec(code, module.__dict__)
+                else:
+                    spec.loader.exec_module(module)
+            except BaseException:
+                sys.modules.pop(module_name, None)
+                raise
+        
+        self._module_cache[path] = (mtime, module, {})
+        return module, True
+    
+    @staticmethod
+    def _module_from_file(module: ModuleType, plugin_file: Path) -> bool:
+        """Whether an already-imported module was loaded from plugin_file"""
+        module_file = getattr(module, "__file__", None)
+        return module_file is not None and Path(module_file).resolve() == plugin_file.resolve()
+    
+    async def _load_plugin_file(self, plugin_file: PluginFile,
+                                imported: Optional[Tuple[ModuleType, bool]] = None) -> None:
+        """Load tools from a single plugin file
+        
+        imported is the result of _import_plugin when the import already ran
+        (discovery imports in parallel); otherwise the file is imported here.
+        """
+        try:
+            module, fresh = imported or self._import_plugin(plugin_file)
             
-            # Auto-register any decorator tools found in this module
-            register_tools_from_module(module, auto_register=True)
+            if fresh:
+                # Auto-register any decorator tools found in this module
+                register_tools_from_module(module, auto_register=True)
+                self._register_class_tools(module)
+                self._module_cache[plugin_file.path] = (
+                    plugin_file.mtime_ns, module, self._module_decorator_tools(module)
+                )
+            else:
+                # Unchanged since last discovery - restore its decorator tools
+                register_decorator_tools(self._module_cache[plugin_file.path][2])
             
             # Find traditional BaseTool subclasses in the module
             tool_classes = self._find_tool_classes(module)
@@ -117,62 +357,96 @@ class PluginManager:
                 
                 # Register tool (check for conflicts)
                 if tool_instance.name in self.loaded_tools:
-                    logging.warning(f"⚠️  Tool name conflict: {tool_instance.name} (skipping duplicate)")
+                    logger.warning("⚠️  Tool name conflict: %s (skipping duplicate)", tool_instance.name)
                     continue
                 
-                self.loaded_tools[tool_instance.name] = tool_instance
-                logging.info(f"  ✓ Loaded traditional tool: {tool_instance.name}")
+                self._register_tool(tool_instance.name, tool_instance)
+                logger.info("  ✓ Loaded traditional tool: %s", tool_instance.name)
                 
         except Exception as e:
-            logging.error(f"  ❌ Error loading {plugin_file.name}: {e}")
+            logger.error("  ❌ Error loading %s: %s", plugin_file.name, e)
             raise
     
-    async def _load_decorator_tools(self) -> None:
-        """Load tools from decorator registry"""
-        decorator_tools = get_decorator_tools()
+    @staticmethod
+    def _register_class_tools(module: ModuleType) -> None:
+        """Re-register @mcp_tool classes of a module imported before this discovery
         
-        for name, tool in decorator_tools.items():
-            # Validate decorator tool
-            try:
-                self._validate_tool(tool)
-                
-                # Check for conflicts with traditional tools
-                if name in self.loaded_tools:
-                    existing_tool = self.loaded_tools[name]
-                    # Only warn if it's actually a different tool, not the same one detected twice
-                    if existing_tool is not tool:
-                        logging.warning(f"⚠️  Tool name conflict: {name} (decorator vs traditional)")
-                        continue
-                    else:
-                        # Same tool detected twice, just skip silently
-                        logging.debug(f"  Tool {name} already loaded, skipping duplicate")
-                        continue
-                
-                self.loaded_tools[name] = tool
-                logging.info(f"  ✓ Loaded decorator tool: {name}")
-                
-            except Exception as e:
-                logging.error(f"  ❌ Invalid decorator tool {name}: {e}")
-                self.failed_plugins.append(f"decorator:{name}")
+        @mcp_tool registers an instance when the class is created, so a module
+        reused from sys.modules has lost those entries to the registry reset.
+        """
+        registry = get_decorator_tools()
+        missing = {}
+        for obj in vars(module).values():
+            if (inspect.isclass(obj) and obj.__module__ == module.__name__
+                    and getattr(obj, "_mcp_auto_register", False) and obj.name not in registry):
+                missing[obj.name] = obj()
+        if missing:
+            register_decorator_tools(missing)
+    
+    @staticmethod
+    def _module_decorator_tools(module: ModuleType) -> Dict[str, BaseTool]:
+        """Decorator-registered tools whose implementation lives in module"""
+        tools = {}
+        for name, tool in get_decorator_tools().items():
+            func = getattr(tool, "_func", None)
+            owner = func.__module__ if func is not None else type(tool).__module__
+            if owner == module.__name__:
+                tools[name] = tool
+        return tools
+    
+    async def _load_decorator_tools(self, decorator_tools: Optional[Dict[str, BaseTool]] = None) -> None:
+        """Load tools from decorator registry (or just the given subset of it)"""
+        if decorator_tools is None:
+            decorator_tools = get_decorator_tools()
+        new_tools = {
+            name: tool for name, tool in decorator_tools.items()
+            if not self._is_loaded(name, tool) and self._try_validate(name, tool)
+        }
+        if not new_tools:
+            return
+        
+        self._register_tools(new_tools)
+        logger.info("  ✓ Loaded %s decorator tools: %s", len(new_tools), list(new_tools))
+    
+    def _is_loaded(self, name: str, tool: BaseTool) -> bool:
+        """Whether name is already taken (warns when it is a different tool)"""
+        existing_tool = self.loaded_tools.get(name)
+        if existing_tool is None:
+            return False
+        # Only warn if it's actually a different tool, not the same one detected twice
+        if existing_tool is not tool:
+            logger.warning("⚠️  Tool name conflict: %s (decorator vs traditional)", name)
+        else:
+            logger.debug("  Tool %s already loaded, skipping duplicate", name)
+        return True
+    
+    def _try_validate(self, name: str, tool: BaseTool) -> bool:
+        """Validate a decorator tool, recording it as failed instead of raising"""
+        try:
+            self._validate_tool(tool)
+        except Exception as e:
+            logger.error("  ❌ Invalid decorator tool %s: %s", name, e)
+            self.failed_plugins.append(f"decorator:{name}")
+            return False
+        return True
     
     def _find_tool_classes(self, module: Any) -> List[Type[BaseTool]]:
         """Find all BaseTool subclasses in a module that aren't already decorator tools"""
         tool_classes = []
+        namespace = vars(module)
         
-        for name in dir(module):
-            obj = getattr(module, name)
+        # Classes are recorded per defining module as they are created, so
+        # classes merely imported into the module don't count
+        for obj in get_tool_classes(module.__name__):
+            if namespace.get(obj.__name__) is not obj:
+                continue  # Nested/local class, or a stale one from an earlier load
             
-            # Check if it's a class that inherits from BaseTool
-            if (isinstance(obj, type) and 
-                issubclass(obj, BaseTool) and 
-                obj is not BaseTool):
-                
-                # Skip classes that have @mcp_tool decorator (already handled by decorator system)
-                if hasattr(obj, '_mcp_tool_decorated'):
-                    logging.debug(f"  Skipping {obj.__name__} - decorated with @mcp_tool")
-                    continue
-                
-                tool_classes.append(obj)
+            # Skip classes that have @mcp_tool decorator (already handled by decorator system)
+            if hasattr(obj, '_mcp_tool_decorated'):
+                logger.debug("  Skipping %s - decorated with @mcp_tool", obj.__name__)
+                continue
+            
+            tool_classes.append(obj)
         
         return tool_classes
     
@@ -188,8 +462,12 @@ class PluginManager:
         if not hasattr(tool, 'execute'):
             raise ValueError(f"Tool {tool.name} missing execute method")
         
-        import asyncio
-        if not asyncio.iscoroutinefunction(tool.execute):
+        # Checked once per class; instances share their class's execute
+        is_coroutine, is_async_gen = _execute_kind(type(tool))
+        if tool.stream:
+            if not is_async_gen:
+                raise ValueError(f"Streaming tool {tool.name} execute method must be an async generator")
+        elif not is_coroutine:
             raise ValueError(f"Tool {tool.name} execute method must be async")
         
         # Validate schema generation doesn't crash
@@ -200,39 +478,87 @@ class PluginManager:
         except Exception as e:
             raise ValueError(f"Tool {tool.name} schema generation failed: {e}")
     
-    @lru_cache(maxsize=1)
+    def _register_tool(self, name: str, tool: BaseTool) -> None:
+        """Add a validated tool and its tools/list entry"""
+        entry = ToolEntry(tool)
+        self.loaded_tools[name] = tool
+        self._entries[name] = entry
+        self._dispatch[name] = (entry.execute, entry.stream)
+        self._tools_by_kind[entry.kind].append(name)
+        self._registry[name] = entry.mcp_entry
+    
+    def _register_tools(self, tools: Dict[str, BaseTool]) -> None:
+        """Add several validated tools, merging each map in one update"""
+        entries = {name: ToolEntry(tool) for name, tool in tools.items()}
+        self.loaded_tools.update(tools)
+        self._entries.update(entries)
+        self._dispatch.update({name: (entry.execute, entry.stream) for name, entry in entries.items()})
+        for name, entry in entries.items():
+            self._tools_by_kind[entry.kind].append(name)
+        self._registry.update({name: entry.mcp_entry for name, entry in entries.items()})
+    
     def get_tool_registry(self) -> Dict[str, Dict[str, Any]]:
         """Get tool registry for MCP tools/list response"""
-        return {
-            name: {
-                "name": tool.name,
-                "description": tool.description,
-                "inputSchema": tool.input_schema
-            }
-            for name, tool in self.loaded_tools.items()
-        }
+        return self._registry
     
     async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a tool by name with given arguments"""
-        if tool_name not in self.loaded_tools:
+        target = self._dispatch.get(tool_name)
+        if target is None:
             raise ToolError(f"Tool not found: {tool_name}", code=-32601)
+        execute, streams = target
         
-        tool = self.loaded_tools[tool_name]
+        if streams:
+            # Collect streamed items for callers that need a single result
+            return {"content": [item async for item in self.stream_tool(tool_name, arguments)]}
         
         try:
-            logging.info(f"⚡ Executing tool: {tool_name} (type: {type(tool).__name__})")
-            result = await tool.execute(**arguments)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("⚡ Executing tool: %s (type: %s)", tool_name, type(self.loaded_tools[tool_name]).__name__)
+            result = await execute(**arguments)
             
-            if not hasattr(result, 'to_dict'):
+            # Resolved once per result class rather than probed per call
+            to_dict = _result_adapter(type(result))
+            if to_dict is None:
                 raise ToolError(f"Tool {tool_name} returned invalid result type")
                 
-            return result.to_dict()
+            return to_dict(result)
             
         except TypeError as e:
             # Handle argument validation errors
             raise ToolError(f"Invalid arguments for {tool_name}: {e}", code=-32602)
         except Exception as e:
-            logging.error(f"❌ Tool execution failed: {e}")
+            logger.error("❌ Tool execution failed: %s", e)
+            raise ToolError(f"Tool execution error: {str(e)}", code=-32603)
+    
+    async def stream_tool(self, tool_name: str, arguments: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Execute a tool, yielding content items as they are produced.
+        
+        Streaming tools yield items straight from their async generator;
+        regular tools yield the items of their finished result.
+        """
+        target = self._dispatch.get(tool_name)
+        if target is None:
+            raise ToolError(f"Tool not found: {tool_name}", code=-32601)
+        execute, streams = target
+        
+        if not streams:
+            result = await self.execute_tool(tool_name, arguments)
+            for item in result["content"]:
+                yield item
+            return
+        
+        try:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("⚡ Streaming tool: %s (type: %s)", tool_name, type(self.loaded_tools[tool_name]).__name__)
+            async for item in execute(**arguments):
+                # Plain strings are shorthand for text content
+                yield {"type": "text", "text": item} if isinstance(item, str) else item
+                
+        except TypeError as e:
+            raise ToolError(f"Invalid arguments for {tool_name}: {e}", code=-32602)
+        except Exception as e:
+            logger.error("❌ Tool execution failed: %s", e)
             raise ToolError(f"Tool execution error: {str(e)}", code=-32603)
     
     def list_tools(self) -> List[str]:
@@ -241,27 +567,24 @@ class PluginManager:
     
     def get_tool_info(self, tool_name: str) -> Dict[str, Any]:
         """Get detailed info about a specific tool"""
-        if tool_name not in self.loaded_tools:
+        entry = self._entries.get(tool_name)
+        if entry is None:
             return {}
         
-        tool = self.loaded_tools[tool_name]
-        tool_type = "decorator" if hasattr(tool, '_func') else "traditional"
-        
+        tool_class = type(entry.tool)
         return {
-            "name": tool.name,
-            "description": tool.description,
-            "schema": tool.input_schema,
-            "class": tool.__class__.__name__,
-            "module": tool.__class__.__module__,
-            "type": tool_type
+            "name": entry.name,
+            "description": entry.description,
+            "schema": entry.schema,
+            "class": tool_class.__name__,
+            "module": tool_class.__module__,
+            "type": entry.kind
         }
     
     def get_stats(self) -> Dict[str, Any]:
         """Get detailed plugin manager statistics"""
-        traditional_tools = [name for name, tool in self.loaded_tools.items() 
-                           if not hasattr(tool, '_func')]
-        decorator_tools = [name for name, tool in self.loaded_tools.items() 
-                         if hasattr(tool, '_func')]
+        traditional_tools = self._tools_by_kind["traditional"]
+        decorator_tools = self._tools_by_kind["decorator"]
         
         return {
             "total_tools": len(self.loaded_tools),
@@ -269,8 +592,8 @@ class PluginManager:
             "decorator_tools": len(decorator_tools),
             "failed_plugins": len(self.failed_plugins),
             "tools_by_type": {
-                "traditional": traditional_tools,
-                "decorator": decorator_tools
+                "traditional": list(traditional_tools),
+                "decorator": list(decorator_tools)
             },
             "failed": self.failed_plugins
         }
@@ -323,6 +646,5 @@ async def test_enhanced_plugin_manager():
 
 
 if __name__ == "__main__":
-    import asyncio
     logging.basicConfig(level=logging.INFO)
     asyncio.run(test_enhanced_plugin_manager())
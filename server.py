@@ -6,27 +6,68 @@ Handles MCP protocol methods: initialize, tools/list, tools/call
 Provides plugin-based tool registration and execution framework.
 """
 import asyncio
+import contextvars
 import logging
+import operator
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from functools import lru_cache
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 
-from transport import MCPRequest, MCPResponse, StdioServerTransport
+import json_codec
+from transport import (
+    METHOD_INITIALIZE,
+    METHOD_INITIALIZED,
+    METHOD_TOOLS_CALL,
+    METHOD_TOOLS_LIST,
+    RESPONSE_DEFERRED,
+    MCPRequest,
+    MCPResponse,
+    StdioServerTransport,
+)
+
+logger = logging.getLogger(__name__)
+
+# Shared default for tools/call without arguments (saves a dict per call);
+# handlers must treat their arguments as read-only
+_EMPTY_ARGS: Dict[str, Any] = {}
+
+# create_task(context=...) is Python 3.11+; tool calls then start from an
+# empty context instead of a copy of the receive loop's. Tools get their
+# inputs as arguments, not through context variables.
+_TASK_CONTEXT = sys.version_info >= (3, 11)
 
 
 @dataclass
 class ToolDefinition:
     """Tool metadata and execution handler"""
 
+    __slots__ = ("name", "description", "input_schema", "handler", "descriptor_json")
+
     name: str
     description: str
     input_schema: Dict[str, Any]
     handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
 
+    def __post_init__(self) -> None:
+        # tools/list entry, JSON-encoded once (schemas don't change after
+        # registration); a slot rather than a dataclass field
+        self.descriptor_json: bytes = json_codec.dumps(
+            {
+                "name": self.name,
+                "description": self.description,
+                "inputSchema": self.input_schema,
+            }
+        )
+
 
 class MCPTool(ABC):
-    """Abstract base for MCP tool plugins"""
+    """Abstract base for MCP tool plugins
+
+    name, description and input_schema may be overridden with properties or,
+    when they are fixed, plain class attributes (no per-access rebuild).
+    """
 
     @property
     @abstractmethod
@@ -55,13 +96,31 @@ class MCPTool(ABC):
 class MCPServer:
     """Main MCP server with protocol handling and tool management"""
 
-    def __init__(self, name: str = "mcp-python-server", version: str = "1.0.0"):
+    def __init__(self, name: str = "mcp-python-server", version: str = "1.0.0",
+                 max_concurrent_tool_calls: int = 32):
         self.name = name
         self.version = version
         self.tools: Dict[str, ToolDefinition] = {}
+        # Encoded tools/list result, rebuilt only after a tool is (re)registered
+        self._tools_list_json: Optional[bytes] = None
         self.transport = StdioServerTransport()
         self.initialized = False
 
+        # tools/call requests run as concurrent tasks (responses go out as
+        # they finish, matched by id); the semaphore bounds how many run
+        self._call_sem = asyncio.Semaphore(max_concurrent_tool_calls)
+        self._call_tasks: Set[asyncio.Task] = set()
+
+        # Method name -> bound handler, so routing is one dict lookup. Until
+        # the client sends "initialized" the tool methods are routed to a
+        # rejecting handler; the real handlers then need no per-call check.
+        self._dispatch: Dict[str, Callable[[MCPRequest], Awaitable[MCPResponse]]] = {
+            METHOD_INITIALIZE: self._handle_initialize,
+            METHOD_INITIALIZED: self._handle_initialized,
+            METHOD_TOOLS_LIST: self._handle_not_initialized,
+            METHOD_TOOLS_CALL: self._handle_not_initialized,
+        }
+
         # Set up transport handler
         self.transport.set_request_handler(self._handle_request)
 
@@ -74,7 +133,8 @@ class MCPServer:
             handler=tool.execute,
         )
         self.tools[tool.name] = definition
-        logging.info(f"Registered tool: {tool.name}")
+        self._tools_list_json = None
+        logger.info("Registered tool: %s", tool.name)
 
     def register_function_tool(
         self,
@@ -86,26 +146,25 @@ class MCPServer:
         """Register a function-based tool (simpler than class-based)"""
         definition = ToolDefinition(name, description, input_schema, handler)
         self.tools[name] = definition
-        logging.info(f"Registered function tool: {name}")
+        self._tools_list_json = None
+        logger.info("Registered function tool: %s", name)
 
     async def start(self) -> None:
         """Start the MCP server"""
-        logging.info(f"Starting MCP server: {self.name} v{self.version}")
-        logging.info(f"Registered tools: {list(self.tools.keys())}")
+        logger.info("Starting MCP server: %s v%s", self.name, self.version)
+        logger.info("Registered tools: %s", list(self.tools.keys()))
         await self.transport.start()
 
+        # Input closed - let in-flight tool calls send their responses
+        if self._call_tasks:
+            await asyncio.gather(*self._call_tasks, return_exceptions=True)
+            self.transport.flush()
+
     async def _handle_request(self, request: MCPRequest) -> MCPResponse:
         """Route MCP requests to appropriate handlers"""
         try:
-            if request.method == "initialize":
-                return await self._handle_initialize(request)
-            elif request.method == "initialized":
-                return await self._handle_initialized(request)
-            elif request.method == "tools/list":
-                return await self._handle_tools_list(request)
-            elif request.method == "tools/call":
-                return await self._handle_tools_call(request)
-            else:
+            handler = self._dispatch.get(request.method)
+            if handler is None:
                 return MCPResponse(
                     id=request.id,
                     error={
@@ -113,8 +172,9 @@ class MCPServer:
                         "message": f"Method not found: {request.method}",
                     },
                 )
+            return await handler(request)
         except Exception as e:
-            logging.error(f"Error handling {request.method}: {e}")
+            logger.error("Error handling %s: %s", request.method, e)
             return MCPResponse(
                 id=request.id,
                 error={"code": -32603, "message": f"Internal error: {str(e)}"},
@@ -122,7 +182,7 @@ class MCPServer:
 
     async def _handle_initialize(self, request: MCPRequest) -> MCPResponse:
         """Handle MCP initialize request"""
-        logging.info("Client initializing...")
+        logger.info("Client initializing...")
 
         # Validate protocol version
         client_version = request.params.get("protocolVersion")
@@ -144,42 +204,38 @@ class MCPServer:
     async def _handle_initialized(self, request: MCPRequest) -> MCPResponse:
         """Handle initialized notification"""
         self.initialized = True
-        logging.info("Client initialization complete")
+        self._dispatch[METHOD_TOOLS_LIST] = self._handle_tools_list
+        self._dispatch[METHOD_TOOLS_CALL] = self._handle_tools_call
+        logger.info("Client initialization complete")
         # Initialized is a notification, no response needed
         return MCPResponse(id=None)  # Will be ignored by transport
 
+    async def _handle_not_initialized(self, request: MCPRequest) -> MCPResponse:
+        """Reject tool methods received before the initialized notification"""
+        return MCPResponse(
+            id=request.id,
+            error={"code": -32002, "message": "Server not initialized"},
+        )
+
     async def _handle_tools_list(self, request: MCPRequest) -> MCPResponse:
         """Handle tools/list request"""
-        if not self.initialized:
-            return MCPResponse(
-                id=request.id,
-                error={"code": -32002, "message": "Server not initialized"},
+        result_json = self._tools_list_json
+        if result_json is None:
+            # Join the per-tool descriptors encoded at registration
+            result_json = self._tools_list_json = (
+                b'{"tools":['
+                + b",".join(tool.descriptor_json for tool in self.tools.values())
+                + b"]}"
             )
+        logger.debug("Returning %s tools", len(self.tools))
 
-        tools_list = [
-            {
-                "name": tool.name,
-                "description": tool.description,
-                "inputSchema": tool.input_schema,
-            }
-            for tool in self.tools.values()
-        ]
-
-        result = {"tools": tools_list}
-        logging.debug(f"Returning {len(tools_list)} tools")
-
-        return MCPResponse(id=request.id, result=result)
+        await self.transport.send_encoded_result(request.id, result_json)
+        return RESPONSE_DEFERRED
 
     async def _handle_tools_call(self, request: MCPRequest) -> MCPResponse:
         """Handle tools/call request"""
-        if not self.initialized:
-            return MCPResponse(
-                id=request.id,
-                error={"code": -32002, "message": "Server not initialized"},
-            )
-
         tool_name = request.params.get("name")
-        arguments = request.params.get("arguments", {})
+        arguments = request.params.get("arguments") or _EMPTY_ARGS
 
         if not tool_name:
             return MCPResponse(
@@ -193,86 +249,113 @@ class MCPServer:
                 error={"code": -32601, "message": f"Tool not found: {tool_name}"},
             )
 
-        try:
-            logging.info(f"Executing tool: {tool_name}")
-            result = await tool.handler(arguments)
-            return MCPResponse(id=request.id, result=result)
+        # Run the tool in its own task so slow tools don't hold up the
+        # requests behind them
+        coro = self._run_tool_call(request, tool, arguments)
+        if _TASK_CONTEXT:
+            task = asyncio.create_task(coro, context=contextvars.Context())
+        else:
+            task = asyncio.create_task(coro)
+        self._call_tasks.add(task)
+        task.add_done_callback(self._call_task_done)
+        return RESPONSE_DEFERRED
+
+    async def _run_tool_call(
+        self, request: MCPRequest, tool: ToolDefinition, arguments: Dict[str, Any]
+    ) -> None:
+        """Execute a tool call and send its response"""
+        async with self._call_sem:
+            try:
+                logger.info("Executing tool: %s", tool.name)
+                result = await tool.handler(arguments)
+
+            except Exception as e:
+                logger.error("Tool execution failed: %s", e)
+                response = MCPResponse(
+                    id=request.id,
+                    error={"code": -32603, "message": f"Tool execution error: {str(e)}"},
+                )
 
-        except Exception as e:
-            logging.error(f"Tool execution failed: {e}")
-            return MCPResponse(
-                id=request.id,
-                error={"code": -32603, "message": f"Tool execution error: {str(e)}"},
-            )
+            else:
+                # Encode here so an unserializable result still gets an answer
+                try:
+                    result_json = json_codec.dumps(result or {})
+                except Exception as e:
+                    logger.error("Failed to encode %s result: %s", tool.name, e)
+                    response = MCPResponse(
+                        id=request.id,
+                        error={"code": -32603, "message": f"Internal error: {str(e)}"},
+                    )
+                else:
+                    await self.transport.send_encoded_result(request.id, result_json)
+                    return
+
+        await self.transport.send_response(response)
+
+    def _call_task_done(self, task: asyncio.Task) -> None:
+        """Forget a finished tool-call task, logging any exception it raised"""
+        self._call_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Tool call task failed", exc_info=task.exception())
 
 
 # Example tool implementations
 class EchoTool(MCPTool):
     """Simple echo tool for testing"""
 
-    @property
-    def name(self) -> str:
-        return "echo"
-
-    @property
-    def description(self) -> str:
-        return "Echo back the input text"
-
-    @property
-    def input_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "text": {"type": "string", "description": "Text to echo back"}
-            },
-            "required": ["text"],
-        }
+    name = "echo"
+    description = "Echo back the input text"
+    input_schema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "text": {"type": "string", "description": "Text to echo back"}
+        },
+        "required": ["text"],
+    }
 
     async def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
         text = args.get("text", "")
         return {"content": [{"type": "text", "text": f"Echo: {text}"}]}
 
 
-class MathTool(MCPTool):
-    """Math operations tool"""
+def _divide(x: float, y: float) -> float:
+    return x / y if y != 0 else float("inf")
 
-    @property
-    def name(self) -> str:
-        return "calculate"
 
-    @property
-    def description(self) -> str:
-        return "Perform basic math operations"
+# Built once at import instead of on every calculate call
+_MATH_OPERATIONS: Dict[str, Callable[[float, float], float]] = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": _divide,
+}
 
-    @property
-    def input_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "operation": {
-                    "type": "string",
-                    "enum": ["add", "subtract", "multiply", "divide"],
-                    "description": "Math operation to perform",
-                },
-                "a": {"type": "number", "description": "First number"},
-                "b": {"type": "number", "description": "Second number"},
+
+class MathTool(MCPTool):
+    """Math operations tool"""
+
+    name = "calculate"
+    description = "Perform basic math operations"
+    input_schema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "operation": {
+                "type": "string",
+                "enum": ["add", "subtract", "multiply", "divide"],
+                "description": "Math operation to perform",
             },
-            "required": ["operation", "a", "b"],
-        }
+            "a": {"type": "number", "description": "First number"},
+            "b": {"type": "number", "description": "Second number"},
+        },
+        "required": ["operation", "a", "b"],
+    }
 
     async def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
         operation = args["operation"]
         a = args["a"]
         b = args["b"]
 
-        operations = {
-            "add": lambda x, y: x + y,
-            "subtract": lambda x, y: x - y,
-            "multiply": lambda x, y: x * y,
-            "divide": lambda x, y: x / y if y != 0 else float("inf"),
-        }
-
-        result = operations[operation](a, b)
+        result = _MATH_OPERATIONS[operation](a, b)
 
         return {
             "content": [{"type": "text", "text": f"{a} {operation} {b} = {result}"}]
@@ -6,13 +6,35 @@ Clean MCP server with dynamic tool loading via plugin manager.
 No hardcoded tools - everything loaded from tools/ directory.
 """
 import asyncio
+import contextvars
 import logging
 import sys
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 
+import json_codec
 from plugin_manager import PluginManager, ToolError
-from transport import MCPRequest, MCPResponse, StdioServerTransport
+from transport import (
+    METHOD_INITIALIZE,
+    METHOD_INITIALIZED,
+    METHOD_TOOLS_CALL,
+    METHOD_TOOLS_LIST,
+    RESPONSE_DEFERRED,
+    MCPRequest,
+    MCPResponse,
+    StdioServerTransport,
+)
+
+logger = logging.getLogger(__name__)
+
+# Shared default for tools/call without arguments (saves a dict per call);
+# handlers must treat their arguments as read-only
+_EMPTY_ARGS: Dict[str, Any] = {}
+
+# create_task(context=...) is Python 3.11+; tool calls then start from an
+# empty context instead of a copy of the receive loop's. Tools get their
+# inputs as arguments, not through context variables.
+_TASK_CONTEXT = sys.version_info >= (3, 11)
 
 
 class MCPServer:
@@ -26,48 +48,67 @@ class MCPServer:
     - Clean separation between server core and tools
     """
 
-    def __init__(self, name: str = "mcp-plugin-server", version: str = "2.0.0", tools_dir: str = "tools"):
+    def __init__(self, name: str = "mcp-plugin-server", version: str = "2.0.0", tools_dir: str = "tools",
+                 max_concurrent_tool_calls: int = 32):
         self.name = name
         self.version = version
         self.transport = StdioServerTransport()
-        self.plugin_manager = PluginManager(tools_dir)
+        self.plugin_manager = PluginManager.shared(tools_dir)
         self.initialized = False
 
+        # tools/call requests run as concurrent tasks (responses go out as
+        # they finish, matched by id); the semaphore bounds how many run
+        self._call_sem = asyncio.Semaphore(max_concurrent_tool_calls)
+        self._call_tasks: Set[asyncio.Task] = set()
+
+        # Encoded tools/list result, rebuilt only after the plugin manager's tool set changes
+        self._tools_list_json: Optional[bytes] = None
+        self.plugin_manager.register_change_callback(self._invalidate_tools_list)
+
+        # Method name -> bound handler, so routing is one dict lookup. Until
+        # the client sends "initialized" the tool methods are routed to a
+        # rejecting handler; the real handlers then need no per-call check.
+        self._dispatch: Dict[str, Callable[[MCPRequest], Awaitable[MCPResponse]]] = {
+            METHOD_INITIALIZE: self._handle_initialize,
+            METHOD_INITIALIZED: self._handle_initialized,
+            METHOD_TOOLS_LIST: self._handle_not_initialized,
+            METHOD_TOOLS_CALL: self._handle_not_initialized,
+        }
+
         # Set up transport handler
         self.transport.set_request_handler(self._handle_request)
 
     async def start(self) -> None:
         """Start the MCP server with plugin discovery"""
-        logging.info(f"🚀 Starting MCP server: {self.name} v{self.version}")
+        logger.info("🚀 Starting MCP server: %s v%s", self.name, self.version)
 
         # Load plugins
-        tools = await self.plugin_manager.discover_and_load_tools()
-        logging.info(f"🔧 Loaded {len(tools)} tools: {list(tools.keys())}")
+        tools = await self.plugin_manager.ensure_loaded()
+        logger.info("🔧 Loaded %s tools: %s", len(tools), list(tools.keys()))
 
         if not tools:
-            logging.warning("⚠️  No tools loaded! Check tools/ directory")
+            logger.warning("⚠️  No tools loaded! Check tools/ directory")
 
         # Start transport
         await self.transport.start()
 
+        # Input closed - let in-flight tool calls send their responses
+        if self._call_tasks:
+            await asyncio.gather(*self._call_tasks, return_exceptions=True)
+            self.transport.flush()
+
     async def _handle_request(self, request: MCPRequest) -> MCPResponse:
         """Route MCP requests to appropriate handlers"""
         try:
-            if request.method == "initialize":
-                return await self._handle_initialize(request)
-            elif request.method == "initialized":
-                return await self._handle_initialized(request)
-            elif request.method == "tools/list":
-                return await self._handle_tools_list(request)
-            elif request.method == "tools/call":
-                return await self._handle_tools_call(request)
-            else:
+            handler = self._dispatch.get(request.method)
+            if handler is None:
                 return MCPResponse(
                     id=request.id,
                     error={"code": -32601, "message": f"Method not found: {request.method}"}
                 )
+            return await handler(request)
         except Exception as e:
-            logging.error(f"❌ Error handling {request.method}: {e}")
+            logger.error("❌ Error handling %s: %s", request.method, e)
             return MCPResponse(
                 id=request.id,
                 error={"code": -32603, "message": f"Internal error: {str(e)}"}
@@ -75,7 +116,7 @@ class MCPServer:
 
     async def _handle_initialize(self, request: MCPRequest) -> MCPResponse:
         """Handle MCP initialize request"""
-        logging.info("🔌 Client initializing...")
+        logger.info("🔌 Client initializing...")
 
         # Validate protocol version
         client_version = request.params.get("protocolVersion")
@@ -103,37 +144,39 @@ class MCPServer:
     async def _handle_initialized(self, request: MCPRequest) -> MCPResponse:
         """Handle initialized notification"""
         self.initialized = True
-        logging.info("✅ Client initialization complete")
+        self._dispatch[METHOD_TOOLS_LIST] = self._handle_tools_list
+        self._dispatch[METHOD_TOOLS_CALL] = self._handle_tools_call
+        logger.info("✅ Client initialization complete")
         # Initialized is a notification, no response needed
         return MCPResponse(id=None)  # Will be ignored by transport
 
+    async def _handle_not_initialized(self, request: MCPRequest) -> MCPResponse:
+        """Reject tool methods received before the initialized notification"""
+        return MCPResponse(
+            id=request.id,
+            error={"code": -32002, "message": "Server not initialized"}
+        )
+
     async def _handle_tools_list(self, request: MCPRequest) -> MCPResponse:
         """Handle tools/list request"""
-        if not self.initialized:
-            return MCPResponse(
-                id=request.id,
-                error={"code": -32002, "message": "Server not initialized"}
-            )
-
         # Get tools from plugin manager
-        tools_registry = self.plugin_manager.get_tool_registry()
-        tools_list = list(tools_registry.values())
+        result_json = self._tools_list_json
+        if result_json is None:
+            tools_list = list(self.plugin_manager.get_tool_registry().values())
+            result_json = self._tools_list_json = json_codec.dumps({"tools": tools_list})
+        logger.debug("Returning %s tools", len(self.plugin_manager.loaded_tools))
 
-        result = {"tools": tools_list}
-        logging.debug(f"📋 Returning {len(tools_list)} tools")
+        await self.transport.send_encoded_result(request.id, result_json)
+        return RESPONSE_DEFERRED
 
-        return MCPResponse(id=request.id, result=result)
+    def _invalidate_tools_list(self) -> None:
+        """Drop the cached tools/list result (plugin manager change callback)"""
+        self._tools_list_json = None
 
     async def _handle_tools_call(self, request: MCPRequest) -> MCPResponse:
         """Handle tools/call request"""
-        if not self.initialized:
-            return MCPResponse(
-                id=request.id,
-                error={"code": -32002, "message": "Server not initialized"}
-            )
-
         tool_name = request.params.get("name")
-        arguments = request.params.get("arguments", {})
+        arguments = request.params.get("arguments") or _EMPTY_ARGS
 
         if not tool_name:
             return MCPResponse(
@@ -141,23 +184,58 @@ class MCPServer:
                 error={"code": -32602, "message": "Missing tool name"}
             )
 
-        try:
-            # Execute tool via plugin manager
-            result = await self.plugin_manager.execute_tool(tool_name, arguments)
-            return MCPResponse(id=request.id, result=result)
+        # Run the tool in its own task so slow tools don't hold up the
+        # requests behind them
+        coro = self._run_tool_call(request, tool_name, arguments)
+        if _TASK_CONTEXT:
+            task = asyncio.create_task(coro, context=contextvars.Context())
+        else:
+            task = asyncio.create_task(coro)
+        self._call_tasks.add(task)
+        task.add_done_callback(self._call_task_done)
+        return RESPONSE_DEFERRED
+
+    async def _run_tool_call(self, request: MCPRequest, tool_name: str, arguments: Dict[str, Any]) -> None:
+        """Execute a tool call and send its response"""
+        async with self._call_sem:
+            try:
+                # Execute tool via plugin manager
+                result = await self.plugin_manager.execute_tool(tool_name, arguments)
+
+            except ToolError as e:
+                # Tool-specific errors with proper codes
+                response = MCPResponse(
+                    id=request.id,
+                    error={"code": e.code, "message": e.message}
+                )
+            except Exception as e:
+                logger.error("❌ Unexpected tool execution error: %s", e)
+                response = MCPResponse(
+                    id=request.id,
+                    error={"code": -32603, "message": f"Internal tool error: {str(e)}"}
+                )
 
-        except ToolError as e:
-            # Tool-specific errors with proper codes
-            return MCPResponse(
-                id=request.id,
-                error={"code": e.code, "message": e.message}
-            )
-        except Exception as e:
-            logging.error(f"❌ Unexpected tool execution error: {e}")
-            return MCPResponse(
-                id=request.id,
-                error={"code": -32603, "message": f"Internal tool error: {str(e)}"}
-            )
+            else:
+                # Encode here so an unserializable result still gets an answer
+                try:
+                    result_json = json_codec.dumps(result or {})
+                except Exception as e:
+                    logger.error("❌ Failed to encode %s result: %s", tool_name, e)
+                    response = MCPResponse(
+                        id=request.id,
+                        error={"code": -32603, "message": f"Internal error: {str(e)}"}
+                    )
+                else:
+                    await self.transport.send_encoded_result(request.id, result_json)
+                    return
+
+        await self.transport.send_response(response)
+
+    def _call_task_done(self, task: asyncio.Task) -> None:
+        """Forget a finished tool-call task, logging any exception it raised"""
+        self._call_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("❌ Tool call task failed", exc_info=task.exception())
 
     def get_server_stats(self) -> Dict[str, Any]:
         """Get server statistics for debugging"""
@@ -172,16 +250,16 @@ class MCPServer:
 
 
 # Enhanced server startup
-async def main():
+async def main(tools_dir: str = "tools"):
     """Main server entry point with enhanced logging"""
-    server = MCPServer()
+    server = MCPServer(tools_dir=tools_dir)
 
     try:
         await server.start()
     except KeyboardInterrupt:
-        logging.info("👋 Server shutdown requested")
+        logger.info("👋 Server shutdown requested")
     except Exception as e:
-        logging.error(f"💥 Server crashed: {e}")
+        logger.error("💥 Server crashed: %s", e)
         raise
 
 
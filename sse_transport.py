@@ -4,30 +4,301 @@ SSE MCP Transport - Server-Sent Events for streaming MCP responses
 Implements reliable streaming for LLM integration with auto-reconnection
 """
 import asyncio
-import json
+import base64
+import itertools
 import logging
+import os
 import time
-import uuid
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Any, AsyncGenerator, Callable, Dict, Optional
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 import aiohttp
 from aiohttp import ClientSession, web
 
+try:
+    import cbor2  # Optional: CBOR event payloads for Accept: application/cbor
+except ImportError:
+    cbor2 = None
+
+import json_codec
 from transport import MCPRequest, MCPResponse
 
+# Pre-encoded "event:" lines for the event types the handlers emit
+_EVENT_LINES: Dict[str, bytes] = {
+    event_type: b"event: %s\n" % event_type.encode()
+    for event_type in (
+        "message",
+        "started",
+        "progress",
+        "token",
+        "result",
+        "result_chunk",
+        "result_end",
+        "completed",
+        "error",
+    )
+}
+
+_CBOR_TYPE = "application/cbor"
+
+# Tool results whose encoding is larger than this are sent as result_chunk events
+_RESULT_CHUNK_THRESHOLD = 64 * 1024
+
+# Frames are buffered per stream and written together once either limit is
+# reached, after _COALESCE_DELAY seconds, or with the end of the stream
+_COALESCE_MAX_BYTES = 16 * 1024
+_COALESCE_MAX_FRAMES = 16
+_COALESCE_DELAY = 0.05
+
+_BOOL_VALUES = {"true": True, "false": False}
+
+
+_stream_counter = itertools.count()
+
+
+def _new_stream_id() -> str:
+    """Unique stream id: process-wide counter plus 64 random bits (hex)"""
+    return f"{next(_stream_counter):016x}{os.urandom(8).hex()}"
+
+
+async def _iterate(items: Iterable[str]) -> AsyncIterator[str]:
+    """Async iterator over an in-memory sequence"""
+    for item in items:
+        yield item
+
+
+@lru_cache(maxsize=256)
+def _static_payload(
+    encoding: Optional[str], items: Tuple[Tuple[str, Any], ...]
+) -> bytes:
+    """Encoded data: for event payloads that repeat verbatim across streams"""
+    data = dict(items)
+    if encoding == "cbor":
+        return base64.b64encode(cbor2.dumps(data))
+    return json_codec.dumps(data)
+
+
+def _chunk_target(result: Any) -> Tuple[List[Any], Any]:
+    """Path to, and the container, whose items a large result is chunked by
+
+    Single-entry dicts and lists are descended into, so an MCP-shaped
+    {"content": [...]} result is chunked per content item.
+    """
+    path: List[Any] = []
+    while len(result) == 1:
+        step, inner = (
+            next(iter(result.items())) if isinstance(result, dict) else (0, result[0])
+        )
+        if not isinstance(inner, (dict, list)):
+            break
+        path.append(step)
+        result = inner
+    return path, result
+
+
+def _encode_item(cbor: bool, data: Any) -> bytes:
+    """Encode one value in the stream's wire format (raw CBOR, not base64)"""
+    return cbor2.dumps(data) if cbor else json_codec.dumps_result(data)
+
+
+def _cbor_head(major: int, length: int) -> bytes:
+    """CBOR initial bytes of a definite-length array (4) or map (5)"""
+    if length < 24:
+        return bytes((major << 5 | length,))
+    for info, size in ((24, 1), (25, 2), (26, 4), (27, 8)):
+        if length < 1 << (8 * size):
+            return bytes((major << 5 | info,)) + length.to_bytes(size, "big")
+    raise ValueError(f"CBOR length too large: {length}")
+
+
+def _join_array(cbor: bool, pieces: List[bytes]) -> bytes:
+    """Array from already encoded items"""
+    if cbor:
+        return _cbor_head(4, len(pieces)) + b"".join(pieces)
+    return b"[%s]" % b",".join(pieces)
+
+
+def _join_map(cbor: bool, pairs: List[Tuple[Any, bytes]]) -> bytes:
+    """Map from (key, already encoded value) pairs"""
+    if cbor:
+        return _cbor_head(5, len(pairs)) + b"".join(
+            cbor2.dumps(key) + piece for key, piece in pairs
+        )
+    return b"{%s}" % b",".join(
+        json_codec.dumps(key if isinstance(key, str) else str(key)) + b":" + piece
+        for key, piece in pairs
+    )
+
+
+def _coerce_query_value(value: str) -> Any:
+    """Convert a query param to a proper type (simple heuristic)"""
+    if value.isdigit():
+        return int(value)
+    return _BOOL_VALUES.get(value.lower(), value)
+
+
+def _json_response(data: Any, status: int = 200) -> web.Response:
+    """JSON response encoded with the fast codec (replaces web.json_response)"""
+    return web.Response(
+        body=json_codec.dumps_result(data),
+        status=status,
+        content_type="application/json",
+    )
+
+
+# Static documentation page, encoded once at import time
+_DOCS_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>SSE MCP Server</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .endpoint { background: #f5f5f5; padding: 10px; margin: 10px 0; border-radius: 5px; }
+        .method { color: #007acc; font-weight: bold; }
+        .sse { color: #28a745; font-weight: bold; }
+        code { background: #eee; padding: 2px 4px; border-radius: 3px; }
+        pre { background: #f8f9fa; padding: 15px; border-radius: 5px; overflow-x: auto; }
+    </style>
+</head>
+<body>
+    <h1>🌊 SSE MCP Server</h1>
+    <p>Server-Sent Events interface for streaming MCP responses</p>
+
+    <h2>📡 SSE Streaming Endpoints</h2>
+
+    <div class="endpoint">
+        <div class="sse">GET /stream/tools/{tool_name}</div>
+        <p>Stream tool execution with real-time progress</p>
+        <code>curl -N "http://localhost:8081/stream/tools/opensearch?query=GDPR&size=100"</code>
+    </div>
+
+    <div class="endpoint">
+        <div class="sse">GET /stream/llm</div>
+        <p>Stream LLM token generation</p>
+        <code>curl -N "http://localhost:8081/stream/llm?prompt=Hello%20world&model=gpt-4"</code>
+    </div>
+
+    <div class="endpoint">
+        <div class="sse">GET /stream/mcp</div>
+        <p>Stream MCP method execution</p>
+        <code>curl -N "http://localhost:8081/stream/mcp?method=tools/list"</code>
+    </div>
+
+    <h2>📋 Traditional HTTP Endpoints</h2>
+
+    <div class="endpoint">
+        <div class="method">GET /tools</div>
+        <p>List available tools</p>
+    </div>
+
+    <div class="endpoint">
+        <div class="method">POST /tools/{tool_name}</div>
+        <p>Execute tool (non-streaming)</p>
+    </div>
+
+    <h2>🌐 JavaScript EventSource Example</h2>
+    <pre>
+const eventSource = new EventSource('/stream/tools/opensearch?query=GDPR');
+
+eventSource.addEventListener('started', (event) => {
+    const data = JSON.parse(event.data);
+    console.log('Tool started:', data);
+});
+
+eventSource.addEventListener('progress', (event) => {
+    const data = JSON.parse(event.data);
+    console.log('Progress:', data);
+});
+
+eventSource.addEventListener('result', (event) => {
+    const data = JSON.parse(event.data);
+    console.log('Result:', data);
+});
+
+// Large results arrive as result_chunk events ({index, key?, item}), then result_end
+// whose path (e.g. ["content"]) says where the chunked items sit in the result
+eventSource.addEventListener('result_chunk', (event) => {
+    const chunk = JSON.parse(event.data);
+    console.log('Result chunk:', chunk.index, chunk.item);
+});
+
+eventSource.addEventListener('completed', (event) => {
+    eventSource.close();
+    console.log('Completed');
+});
+
+eventSource.addEventListener('error', (event) => {
+    console.error('Stream error');
+});
+    </pre>
+
+    <h2>📦 CBOR Payloads</h2>
+    <p>Clients that send <code>Accept: application/cbor</code> (server needs <code>cbor2</code>)
+    get base64-encoded CBOR in <code>data:</code> instead of JSON. The response carries
+    <code>X-Stream-Encoding: cbor</code>. EventSource cannot set headers, so read the stream
+    with <code>fetch()</code> and decode each payload with <a href="https://github.com/kriszyp/cbor-x">cbor-x</a>:</p>
+    <pre>
+import { decode } from 'cbor-x';
+
+const response = await fetch('/stream/tools/opensearch?query=GDPR', {
+    headers: { Accept: 'text/event-stream, application/cbor' }
+});
+// For each "data:" line of the stream:
+const bytes = Uint8Array.from(atob(payload), (c) => c.charCodeAt(0));
+console.log('Event data:', decode(bytes));
+    </pre>
+
+    <h2>✨ Features</h2>
+    <ul>
+        <li>🔄 <strong>Auto-reconnection</strong> - Built into EventSource</li>
+        <li>🛡️ <strong>Firewall-friendly</strong> - Standard HTTP</li>
+        <li>📊 <strong>Real-time progress</strong> - For long operations</li>
+        <li>🤖 <strong>LLM streaming</strong> - Token-by-token responses</li>
+        <li>🔧 <strong>Tool streaming</strong> - Progressive results</li>
+        <li>⚡ <strong>uvloop</strong> - Used as the event loop when installed</li>
+    </ul>
+</body>
+</html>
+"""
+_DOCS_BODY = _DOCS_HTML.encode("utf-8")
+
 
 @dataclass
 class SSEContext:
     """SSE streaming context with hierarchical management"""
 
-    stream_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    stream_id: str = field(default_factory=_new_stream_id)
     client_info: Dict[str, Any] = field(default_factory=dict)
-    start_time: float = field(default_factory=time.time)
+    start_time: int = field(default_factory=time.monotonic_ns)  # ns, monotonic
     message_count: int = 0
     active: bool = True
     metadata: Dict[str, Any] = field(default_factory=dict)
+    response: Optional[web.StreamResponse] = field(default=None, repr=False)
+    _pending: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    _pending_count: int = field(default=0, init=False, repr=False)
+    _flush_handle: Optional[asyncio.TimerHandle] = field(
+        default=None, init=False, repr=False
+    )
+    _flush_task: Optional["asyncio.Task[None]"] = field(
+        default=None, init=False, repr=False
+    )
+
+    def elapsed(self) -> float:
+        """Seconds since the stream started"""
+        return (time.monotonic_ns() - self.start_time) / 1e9
 
 
 class SSETransport:
@@ -48,6 +319,9 @@ class SSETransport:
         self.app = web.Application()
         self.request_handler: Optional[Callable] = None
         self.plugin_manager = None
+        self.token_source: Optional[Callable[[str, str], AsyncIterator[str]]] = None
+        self._tools_list: Optional[List[Dict[str, Any]]] = None
+        self._tools_list_body: Optional[bytes] = None
         self.active_streams: Dict[str, SSEContext] = {}
         self._setup_routes()
         self._setup_cors()
@@ -59,6 +333,25 @@ class SSETransport:
     def set_plugin_manager(self, plugin_manager):
         """Set plugin manager for streaming tools"""
         self.plugin_manager = plugin_manager
+        plugin_manager.register_change_callback(self._invalidate_tools_list)
+
+    def get_tools_list(self) -> List[Dict[str, Any]]:
+        """Tool descriptors with their streaming URLs (cached until the tools change)"""
+        if self._tools_list is None:
+            self._tools_list = [
+                {**tool, "streaming_url": f"/stream/tools/{tool['name']}"}
+                for tool in self.plugin_manager.get_tool_registry().values()
+            ]
+        return self._tools_list
+
+    def _invalidate_tools_list(self):
+        """Drop the cached tool listing (plugin manager change callback)"""
+        self._tools_list = None
+        self._tools_list_body = None
+
+    def set_token_source(self, token_source: Callable[[str, str], AsyncIterator[str]]):
+        """Set LLM backend for /stream/llm: (prompt, model) -> async token iterator"""
+        self.token_source = token_source
 
     def _setup_routes(self):
         """Setup SSE and HTTP routes"""
@@ -119,7 +412,7 @@ class SSETransport:
             stream_url = f"/stream/tools/{tool_name}?{query_string}"
 
             # Return streaming instructions
-            return web.json_response(
+            return _json_response(
                 {
                     "message": "Use EventSource with the provided URL for streaming",
                     "stream_url": stream_url,
@@ -132,7 +425,7 @@ class SSETransport:
 
         except Exception as e:
             logging.error(f"❌ POST stream error for {tool_name}: {e}")
-            return web.json_response({"error": str(e), "tool": tool_name}, status=500)
+            return _json_response({"error": str(e), "tool": tool_name}, status=500)
 
         self.app.middlewares.append(cors_handler)
 
@@ -148,7 +441,9 @@ class SSETransport:
 
         self.app.router.add_options("/{path:.*}", options_handler)
 
-    async def _create_sse_response(self, request: web.Request) -> web.StreamResponse:
+    async def _create_sse_response(
+        self, request: web.Request, context: SSEContext
+    ) -> web.StreamResponse:
         """Create SSE response with proper headers"""
         response = web.StreamResponse()
         response.headers.update(
@@ -157,13 +452,22 @@ class SSETransport:
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
                 "X-Accel-Buffering": "no",  # Disable nginx buffering
+                "Vary": "Accept",
             }
         )
 
+        # Binary-capable clients get base64 CBOR in data: instead of JSON
+        if cbor2 is not None and _CBOR_TYPE in request.headers.get("Accept", ""):
+            context.metadata["encoding"] = "cbor"
+            response.headers["X-Stream-Encoding"] = "cbor"
+
         # Handle reconnection
         last_event_id = request.headers.get("Last-Event-ID", "0")
 
         await response.prepare(request)
+        # Registered only once it can be written to (broadcast_to_streams)
+        context.response = response
+        self.active_streams[context.stream_id] = context
         return response
 
     async def _send_sse_message(
@@ -173,47 +477,204 @@ class SSETransport:
         event_type: str = "message",
         data: Any = None,
         event_id: Optional[str] = None,
+        encoded: Optional[bytes] = None,
     ):
-        """Send SSE formatted message"""
+        """Send SSE formatted message (encoded: data already encoded for the stream)"""
         try:
             if event_id is None:
-                event_id = str(context.message_count)
-
-            message_lines = []
-            message_lines.append(f"id: {event_id}")
-            message_lines.append(f"event: {event_type}")
+                id_line = b"id: %d\n" % context.message_count
+            else:
+                id_line = b"id: %s\n" % event_id.encode()
 
-            if data is not None:
-                json_data = json.dumps(data)
-                message_lines.append(f"data: {json_data}")
+            event_line = _EVENT_LINES.get(event_type)
+            if event_line is None:
+                event_line = b"event: %s\n" % event_type.encode()
 
-            message_lines.append("")  # Empty line terminates message
+            if encoded is None and data is not None:
+                if context.metadata.get("encoding") == "cbor":
+                    encoded = base64.b64encode(cbor2.dumps(data))
+                else:
+                    encoded = json_codec.dumps_result(data)
 
-            message = "\n".join(message_lines) + "\n"
-            await response.write(message.encode())
+            # Empty line terminates message
+            if encoded is None:
+                frame = b"%s%s\n" % (id_line, event_line)
+            else:
+                frame = b"%s%sdata: %s\n\n" % (id_line, event_line, encoded)
 
             context.message_count += 1
+            context._pending += frame
+            context._pending_count += 1
+
+        except Exception as e:
+            logging.error(f"❌ SSE send error: {e}")
+            self._deactivate(context)
+            return
+
+        if (
+            context._pending_count >= _COALESCE_MAX_FRAMES
+            or len(context._pending) >= _COALESCE_MAX_BYTES
+        ):
+            await self._flush_sse(response, context)
+        elif context._flush_handle is None:
+            # Low-rate streams still see their frames promptly
+            context._flush_handle = asyncio.get_running_loop().call_later(
+                _COALESCE_DELAY, self._schedule_flush, response, context
+            )
+
+    def _schedule_flush(self, response: web.StreamResponse, context: SSEContext):
+        """Timer callback: flush the frames buffered on context"""
+        context._flush_handle = None
+        context._flush_task = asyncio.ensure_future(self._flush_sse(response, context))
+
+    async def _flush_sse(self, response: web.StreamResponse, context: SSEContext):
+        """Write out the frames buffered on context in one write"""
+        if context._flush_handle is not None:
+            context._flush_handle.cancel()
+            context._flush_handle = None
+        if not context._pending:
+            return
+
+        data = bytes(context._pending)
+        context._pending.clear()
+        context._pending_count = 0
+        try:
+            await response.write(data)
+        except Exception as e:
+            logging.error(f"❌ SSE send error: {e}")
+            self._deactivate(context)
+
+    def _deactivate(self, context: SSEContext):
+        """Mark a stream dead and unlink it, so only live streams stay registered"""
+        context.active = False
+        self.active_streams.pop(context.stream_id, None)
 
+    async def _finish_stream(self, response: web.StreamResponse, context: SSEContext):
+        """Forget a finished stream and end its response
+
+        The frames still buffered go out with the final chunk in a single
+        write_eof(); streams that already failed just drop them.
+        """
+        if context._flush_handle is not None:
+            context._flush_handle.cancel()
+            context._flush_handle = None
+        self.active_streams.pop(context.stream_id, None)
+
+        data = bytes(context._pending)
+        context._pending.clear()
+        if not context.active:
+            return
+        try:
+            await response.write_eof(data)
         except Exception as e:
             logging.error(f"❌ SSE send error: {e}")
             context.active = False
 
+    async def _send_tool_result(
+        self,
+        response: web.StreamResponse,
+        context: SSEContext,
+        tool_name: str,
+        result: Any,
+    ):
+        """Send a tool result as one result event, or chunked when it is large
+
+        Results are chunked by the items of their innermost single-entry
+        container (the content list of an MCP result): one result_chunk
+        event per item, then result_end carrying the container's path.
+        Each item is encoded once and reused for the single-event form.
+        """
+        cbor = context.metadata.get("encoding") == "cbor"
+
+        if isinstance(result, (dict, list)) and result:
+            path, container = _chunk_target(result)
+            if isinstance(container, dict):
+                keys: Optional[List[Any]] = list(container)
+                pieces = [_encode_item(cbor, item) for item in container.values()]
+            else:
+                keys = None
+                pieces = [_encode_item(cbor, item) for item in container]
+
+            if sum(map(len, pieces)) > _RESULT_CHUNK_THRESHOLD:
+                await self._send_result_chunks(
+                    response, context, tool_name, cbor, path, keys, pieces
+                )
+                return
+
+            if keys is None:
+                encoded = _join_array(cbor, pieces)
+            else:
+                encoded = _join_map(cbor, list(zip(keys, pieces)))
+            for step in reversed(path):
+                encoded = (
+                    _join_map(cbor, [(step, encoded)])
+                    if isinstance(step, str)
+                    else _join_array(cbor, [encoded])
+                )
+        else:
+            encoded = _encode_item(cbor, result)
+
+        frame = _join_map(
+            cbor,
+            [
+                ("tool", _encode_item(cbor, tool_name)),
+                ("result", encoded),
+                ("status", _encode_item(cbor, "completed")),
+            ],
+        )
+        await self._send_sse_message(
+            response,
+            context,
+            "result",
+            encoded=base64.b64encode(frame) if cbor else frame,
+        )
+
+    async def _send_result_chunks(
+        self,
+        response: web.StreamResponse,
+        context: SSEContext,
+        tool_name: str,
+        cbor: bool,
+        path: List[Any],
+        keys: Optional[List[Any]],
+        pieces: List[bytes],
+    ):
+        """Send pre-encoded container items as result_chunk events, then result_end"""
+        for index, piece in enumerate(pieces):
+            if not context.active:
+                return
+            fields = [("index", _encode_item(cbor, index))]
+            if keys is not None:
+                fields.append(("key", _encode_item(cbor, keys[index])))
+            fields.append(("item", piece))
+            frame = _join_map(cbor, fields)
+            await self._send_sse_message(
+                response,
+                context,
+                "result_chunk",
+                encoded=base64.b64encode(frame) if cbor else frame,
+            )
+
+        await self._send_sse_message(
+            response,
+            context,
+            "result_end",
+            {
+                "tool": tool_name,
+                "path": path,
+                "chunks": len(pieces),
+                "status": "completed",
+            },
+        )
+
     async def _handle_tool_stream(self, request: web.Request) -> web.StreamResponse:
         """Handle GET /stream/tools/{tool_name} - Stream tool execution"""
         tool_name = request.match_info["tool_name"]
-        arguments = {k: v for k, v in request.query.items()}
-
-        # Convert query params to proper types (simple heuristic)
-        for key, value in arguments.items():
-            if value.isdigit():
-                arguments[key] = int(value)
-            elif value.lower() in ["true", "false"]:
-                arguments[key] = value.lower() == "true"
+        arguments = {k: _coerce_query_value(v) for k, v in request.query.items()}
 
         context = SSEContext()
-        self.active_streams[context.stream_id] = context
 
-        response = await self._create_sse_response(request)
+        response = await self._create_sse_response(request, context)
         response.headers["X-Stream-ID"] = context.stream_id
 
         try:
@@ -252,7 +713,10 @@ class SSETransport:
                     response,
                     context,
                     "progress",
-                    {"message": f"Executing {tool_name}...", "progress": 0.3},
+                    encoded=_static_payload(
+                        context.metadata.get("encoding"),
+                        (("message", f"Executing {tool_name}..."), ("progress", 0.3)),
+                    ),
                 )
 
                 # Execute the tool
@@ -262,12 +726,7 @@ class SSETransport:
                     f"✅ Tool {tool_name} completed with result: {type(result)}"
                 )
 
-                await self._send_sse_message(
-                    response,
-                    context,
-                    "result",
-                    {"tool": tool_name, "result": result, "status": "completed"},
-                )
+                await self._send_tool_result(response, context, tool_name, result)
 
             # Send completion
             await self._send_sse_message(
@@ -276,28 +735,21 @@ class SSETransport:
                 "completed",
                 {
                     "message": "Tool execution completed",
-                    "duration": time.time() - context.start_time,
+                    "duration": context.elapsed(),
                 },
             )
 
         except Exception as e:
-            logging.error(f"❌ Tool stream error for {tool_name}: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logging.exception("❌ Tool stream error for %s", tool_name)
             await self._send_sse_message(
                 response,
                 context,
                 "error",
-                {
-                    "error": str(e),
-                    "tool": tool_name,
-                    "traceback": traceback.format_exc(),
-                },
+                {"error": str(e), "tool": tool_name, "type": type(e).__name__},
             )
 
         finally:
-            self.active_streams.pop(context.stream_id, None)
+            await self._finish_stream(response, context)
             logging.info(f"🧹 Cleaned up stream for {tool_name}")
 
         return response
@@ -308,9 +760,8 @@ class SSETransport:
         model = request.query.get("model", "default")
 
         context = SSEContext()
-        self.active_streams[context.stream_id] = context
 
-        response = await self._create_sse_response(request)
+        response = await self._create_sse_response(request, context)
         response.headers["X-Stream-ID"] = context.stream_id
 
         try:
@@ -326,14 +777,21 @@ class SSETransport:
                 },
             )
 
-            # Simulate LLM streaming (replace with actual LLM integration)
-            tokens = (
-                prompt.split()
-                if prompt
-                else ["Hello", "world", "from", "streaming", "MCP"]
-            )
+            if self.token_source is not None:
+                tokens = self.token_source(prompt, model)
+                total = None
+            else:
+                # Simulate LLM streaming (no token source wired)
+                words = (
+                    prompt.split()
+                    if prompt
+                    else ["Hello", "world", "from", "streaming", "MCP"]
+                )
+                tokens = _iterate(words)
+                total = len(words)
 
-            for i, token in enumerate(tokens):
+            token_count = 0
+            async for token in tokens:
                 if not context.active:
                     break
 
@@ -341,11 +799,9 @@ class SSETransport:
                     response,
                     context,
                     "token",
-                    {"token": token, "position": i, "total": len(tokens)},
+                    {"token": token, "position": token_count, "total": total},
                 )
-
-                # Simulate processing delay
-                await asyncio.sleep(0.1)
+                token_count += 1
 
             # Send completion
             await self._send_sse_message(
@@ -354,8 +810,8 @@ class SSETransport:
                 "completed",
                 {
                     "message": "LLM response completed",
-                    "token_count": len(tokens),
-                    "duration": time.time() - context.start_time,
+                    "token_count": token_count,
+                    "duration": context.elapsed(),
                 },
             )
 
@@ -366,7 +822,7 @@ class SSETransport:
             )
 
         finally:
-            self.active_streams.pop(context.stream_id, None)
+            await self._finish_stream(response, context)
 
         return response
 
@@ -375,9 +831,8 @@ class SSETransport:
         method = request.query.get("method", "tools/list")
 
         context = SSEContext()
-        self.active_streams[context.stream_id] = context
 
-        response = await self._create_sse_response(request)
+        response = await self._create_sse_response(request, context)
 
         try:
             # Parse params from query string
@@ -406,7 +861,13 @@ class SSETransport:
                 )
 
             await self._send_sse_message(
-                response, context, "completed", {"message": "MCP method completed"}
+                response,
+                context,
+                "completed",
+                encoded=_static_payload(
+                    context.metadata.get("encoding"),
+                    (("message", "MCP method completed"),),
+                ),
             )
 
         except Exception as e:
@@ -415,7 +876,7 @@ class SSETransport:
             )
 
         finally:
-            self.active_streams.pop(context.stream_id, None)
+            await self._finish_stream(response, context)
 
         return response
 
@@ -431,7 +892,7 @@ class SSETransport:
             )
 
             if not self.request_handler:
-                return web.json_response(
+                return _json_response(
                     {
                         "jsonrpc": "2.0",
                         "id": mcp_request.id,
@@ -448,10 +909,10 @@ class SSETransport:
             elif response.error is not None:
                 response_data["error"] = response.error
 
-            return web.json_response(response_data)
+            return _json_response(response_data)
 
         except Exception as e:
-            return web.json_response(
+            return _json_response(
                 {
                     "jsonrpc": "2.0",
                     "id": None,
@@ -464,27 +925,26 @@ class SSETransport:
         """Handle GET /tools"""
         try:
             if not self.plugin_manager:
-                return web.json_response(
+                return _json_response(
                     {"error": "Plugin manager not configured"}, status=500
                 )
 
-            tools_registry = self.plugin_manager.get_tool_registry()
-            tools_list = list(tools_registry.values())
-
-            # Add streaming URLs to each tool
-            for tool in tools_list:
-                tool["streaming_url"] = f"/stream/tools/{tool['name']}"
+            if self._tools_list_body is None:
+                tools_list = self.get_tools_list()
+                self._tools_list_body = json_codec.dumps(
+                    {
+                        "tools": tools_list,
+                        "count": len(tools_list),
+                        "streaming_available": True,
+                    }
+                )
 
-            return web.json_response(
-                {
-                    "tools": tools_list,
-                    "count": len(tools_list),
-                    "streaming_available": True,
-                }
+            return web.Response(
+                body=self._tools_list_body, content_type="application/json"
             )
 
         except Exception as e:
-            return web.json_response({"error": str(e)}, status=500)
+            return _json_response({"error": str(e)}, status=500)
 
     async def _handle_call_tool(self, request: web.Request) -> web.Response:
         """Handle POST /tools/{tool_name}"""
@@ -497,7 +957,7 @@ class SSETransport:
 
         try:
             result = await self.plugin_manager.execute_tool(tool_name, arguments)
-            return web.json_response(
+            return _json_response(
                 {
                     "tool": tool_name,
                     "result": result,
@@ -506,11 +966,11 @@ class SSETransport:
             )
 
         except Exception as e:
-            return web.json_response({"tool": tool_name, "error": str(e)}, status=500)
+            return _json_response({"tool": tool_name, "error": str(e)}, status=500)
 
     async def _handle_health(self, request: web.Request) -> web.Response:
         """Health check with streaming info"""
-        return web.json_response(
+        return _json_response(
             {
                 "status": "healthy",
                 "server": "SSE MCP Server",
@@ -528,7 +988,7 @@ class SSETransport:
 
     async def _handle_stats(self, request: web.Request) -> web.Response:
         """Server statistics"""
-        return web.json_response(
+        return _json_response(
             {
                 "server": {
                     "name": "SSE MCP Server",
@@ -555,110 +1015,20 @@ class SSETransport:
             streams_info.append(
                 {
                     "stream_id": stream_id,
-                    "duration": time.time() - context.start_time,
+                    "duration": context.elapsed(),
                     "message_count": context.message_count,
                     "active": context.active,
                     "client_info": context.client_info,
                 }
             )
 
-        return web.json_response(
+        return _json_response(
             {"active_streams": len(self.active_streams), "streams": streams_info}
         )
 
     async def _handle_docs(self, request: web.Request) -> web.Response:
         """API documentation with SSE examples"""
-        docs_html = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>SSE MCP Server</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 40px; }
-        .endpoint { background: #f5f5f5; padding: 10px; margin: 10px 0; border-radius: 5px; }
-        .method { color: #007acc; font-weight: bold; }
-        .sse { color: #28a745; font-weight: bold; }
-        code { background: #eee; padding: 2px 4px; border-radius: 3px; }
-        pre { background: #f8f9fa; padding: 15px; border-radius: 5px; overflow-x: auto; }
-    </style>
-</head>
-<body>
-    <h1>🌊 SSE MCP Server</h1>
-    <p>Server-Sent Events interface for streaming MCP responses</p>
-
-    <h2>📡 SSE Streaming Endpoints</h2>
-
-    <div class="endpoint">
-        <div class="sse">GET /stream/tools/{tool_name}</div>
-        <p>Stream tool execution with real-time progress</p>
-        <code>curl -N "http://localhost:8081/stream/tools/opensearch?query=GDPR&size=100"</code>
-    </div>
-
-    <div class="endpoint">
-        <div class="sse">GET /stream/llm</div>
-        <p>Stream LLM token generation</p>
-        <code>curl -N "http://localhost:8081/stream/llm?prompt=Hello%20world&model=gpt-4"</code>
-    </div>
-
-    <div class="endpoint">
-        <div class="sse">GET /stream/mcp</div>
-        <p>Stream MCP method execution</p>
-        <code>curl -N "http://localhost:8081/stream/mcp?method=tools/list"</code>
-    </div>
-
-    <h2>📋 Traditional HTTP Endpoints</h2>
-
-    <div class="endpoint">
-        <div class="method">GET /tools</div>
-        <p>List available tools</p>
-    </div>
-
-    <div class="endpoint">
-        <div class="method">POST /tools/{tool_name}</div>
-        <p>Execute tool (non-streaming)</p>
-    </div>
-
-    <h2>🌐 JavaScript EventSource Example</h2>
-    <pre>
-const eventSource = new EventSource('/stream/tools/opensearch?query=GDPR');
-
-eventSource.addEventListener('started', (event) => {
-    const data = JSON.parse(event.data);
-    console.log('Tool started:', data);
-});
-
-eventSource.addEventListener('progress', (event) => {
-    const data = JSON.parse(event.data);
-    console.log('Progress:', data);
-});
-
-eventSource.addEventListener('result', (event) => {
-    const data = JSON.parse(event.data);
-    console.log('Result:', data);
-});
-
-eventSource.addEventListener('completed', (event) => {
-    eventSource.close();
-    console.log('Completed');
-});
-
-eventSource.addEventListener('error', (event) => {
-    console.error('Stream error');
-});
-    </pre>
-
-    <h2>✨ Features</h2>
-    <ul>
-        <li>🔄 <strong>Auto-reconnection</strong> - Built into EventSource</li>
-        <li>🛡️ <strong>Firewall-friendly</strong> - Standard HTTP</li>
-        <li>📊 <strong>Real-time progress</strong> - For long operations</li>
-        <li>🤖 <strong>LLM streaming</strong> - Token-by-token responses</li>
-        <li>🔧 <strong>Tool streaming</strong> - Progressive results</li>
-    </ul>
-</body>
-</html>
-        """
-        return web.Response(text=docs_html, content_type="text/html")
+        return web.Response(body=_DOCS_BODY, content_type="text/html", charset="utf-8")
 
     async def start_server(self):
         """Start the SSE MCP server"""
@@ -684,15 +1054,10 @@ eventSource.addEventListener('error', (event) => {
 
     async def broadcast_to_streams(self, event_type: str, data: Any):
         """Broadcast message to all active streams"""
-        dead_streams = []
-
-        for stream_id, context in self.active_streams.items():
-            if not context.active:
-                dead_streams.append(stream_id)
-
-        # Clean up dead streams
-        for stream_id in dead_streams:
-            self.active_streams.pop(stream_id, None)
+        # Dead streams unlink themselves, so no cleanup scan is needed; copy
+        # because a failed send removes its stream
+        for context in list(self.active_streams.values()):
+            await self._send_sse_message(context.response, context, event_type, data)
 
 
 # SSE-enabled MCP Server
@@ -709,7 +1074,7 @@ class SSEMCPServer:
 
     async def start(self):
         """Start the SSE MCP server"""
-        tools = await self.plugin_manager.discover_and_load_tools()
+        tools = await self.plugin_manager.ensure_loaded()
         logging.info(f"🔧 Loaded {len(tools)} tools: {list(tools.keys())}")
         await self.transport.start_server()
 
@@ -755,14 +1120,7 @@ class SSEMCPServer:
         return MCPResponse(id=None)
 
     async def _handle_tools_list(self, request):
-        tools_registry = self.plugin_manager.get_tool_registry()
-        tools_list = list(tools_registry.values())
-
-        # Add streaming URLs to each tool
-        for tool in tools_list:
-            tool["streaming_url"] = f"/stream/tools/{tool['name']}"
-
-        result = {"tools": tools_list}
+        result = {"tools": self.transport.get_tools_list()}
         return MCPResponse(id=request.id, result=result)
 
     async def _handle_tools_call(self, request):
@@ -782,14 +1140,15 @@ class SSEMCPServer:
 
 
 if __name__ == "__main__":
+    import event_loop
 
     async def main():
         from plugin_manager import PluginManager
 
-        plugin_manager = PluginManager("tools")
+        plugin_manager = PluginManager.shared("tools")
         server = SSEMCPServer(plugin_manager, host="localhost", port=8081)
 
         await server.start()
 
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(main())
+    event_loop.run(main())
@@ -11,8 +11,7 @@ Provides multiple decorator patterns to make tool implementation as simple as po
 import inspect
 import logging
 from typing import Any, Dict, Callable, Optional, get_type_hints, Union
-from functools import wraps, lru_cache
-from dataclasses import dataclass
+from functools import wraps
 
 from base_tool import BaseTool, ToolResult, ToolError
 
@@ -26,6 +25,11 @@ def get_decorator_tools() -> Dict[str, BaseTool]:
     return _DECORATOR_TOOL_REGISTRY.copy()
 
 
+def register_decorator_tools(tools: Dict[str, BaseTool]) -> None:
+    """Re-register previously created decorator tools (e.g. from a cached module)"""
+    _DECORATOR_TOOL_REGISTRY.update(tools)
+
+
 class DecoratorTool(BaseTool):
     """Tool wrapper for function-based tools"""
     
@@ -129,7 +133,8 @@ class DecoratorTool(BaseTool):
             args = get_args(python_type)
             if len(args) == 2 and type(None) in args:
                 non_none_type = next(arg for arg in args if arg is not type(None))
-                return DecoratorTool._python_type_to_json_type(non_none_type)
+                base_schema = DecoratorTool._python_type_to_json_type(non_none_type)
+                return {**base_schema, "nullable": True}
         
         # Enhanced type mapping with proper dict handling
         type_mapping = {
@@ -256,6 +261,7 @@ def mcp_tool(name: str, description: str, auto_register: bool = True):
         cls.name = name
         cls.description = description
         cls._mcp_tool_decorated = True  # Mark as decorator tool
+        cls._mcp_auto_register = auto_register
         
         # Ensure it inherits from BaseTool
         if not issubclass(cls, BaseTool):
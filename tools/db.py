@@ -12,11 +12,7 @@ from typing import Any, Dict, Optional
 
 sys.path.append("..")
 from base_tool import ToolError, ToolResult
-# Clear any cached registrations
-from tool_decorators import (MethodToolRegistry, clear_decorator_registry,
-                             tool, tool_method)
-
-clear_decorator_registry()
+from tool_decorators import MethodToolRegistry, tool, tool_method
 
 
 @tool("opensearch", "Search and retrieve regulation documents - use this tool when user asks to search, find, or get documents")
@@ -6,11 +6,53 @@ Server-side stdio transport for MCP protocol communication.
 Handles incoming requests and outgoing responses via stdin/stdout.
 """
 import asyncio
-import json
 import logging
 import sys
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import json_codec
+
+try:
+    import msgspec
+except ImportError:  # Optional dependency
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# MCP method names, interned; incoming method strings are interned too, so
+# dispatch-table lookups match on identity
+METHOD_INITIALIZE = sys.intern("initialize")
+METHOD_INITIALIZED = sys.intern("initialized")
+METHOD_TOOLS_LIST = sys.intern("tools/list")
+METHOD_TOOLS_CALL = sys.intern("tools/call")
+
+# Queued output is written out immediately once it reaches this size
+_WRITE_BUFFER_SIZE = 64 * 1024
+
+
+def _intern_method(method: Any) -> Any:
+    """Intern a decoded method name (non-strings are left for validation)"""
+    return sys.intern(method) if type(method) is str else method
+
+
+if msgspec is not None:
+
+    class _MCPRequestWire(msgspec.Struct):
+        """Wire shape of a JSON-RPC request, decoded directly in C"""
+        method: Any = None
+        params: Any = {}
+        id: Any = None
+
+    _MCP_REQUEST_DECODER = msgspec.json.Decoder(_MCPRequestWire)
 
 
 @dataclass
@@ -23,11 +65,36 @@ class MCPRequest:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "MCPRequest":
         return cls(
-            method=data["method"],
+            method=_intern_method(data["method"]),
             params=data.get("params", {}),
             id=data.get("id")
         )
 
+    @classmethod
+    def from_json(cls, raw: bytes) -> "MCPRequest":
+        """Decode a raw JSON-RPC body, skipping the intermediate dict when msgspec is available.
+
+        Raises json_codec.JSONDecodeError for malformed JSON and ValueError
+        when the body is not a JSON object.
+        """
+        if msgspec is None:
+            data = json_codec.loads(raw)
+            if not isinstance(data, dict):
+                raise ValueError("JSON-RPC request must be an object")
+            return cls(
+                method=_intern_method(data.get("method")),
+                params=data.get("params", {}),
+                id=data.get("id")
+            )
+
+        try:
+            wire = _MCP_REQUEST_DECODER.decode(raw)
+        except msgspec.ValidationError as e:
+            raise ValueError(f"Invalid JSON-RPC request: {e}") from e
+        except msgspec.DecodeError as e:
+            raise json_codec.JSONDecodeError(str(e), raw.decode("utf-8", "replace"), 0) from e
+        return cls(method=_intern_method(wire.method), params=wire.params, id=wire.id)
+
 
 @dataclass
 class MCPResponse:
@@ -45,12 +112,22 @@ class MCPResponse:
         return response
 
 
+# Returned by a request handler that will send its response itself later
+# (via send_response), e.g. a tool call running in its own task
+RESPONSE_DEFERRED = MCPResponse(id=None)
+
+
 class StdioServerTransport:
     """Server-side stdio transport for MCP communication"""
 
     def __init__(self):
         self.running = False
         self.request_handler: Optional[Callable[[MCPRequest], Awaitable[MCPResponse]]] = None
+        # Outgoing lines queued in this loop iteration; written with one
+        # write+flush from a call_soon callback (FIFO order preserved)
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._flush_scheduled = False
 
     def set_request_handler(self, handler: Callable[[MCPRequest], Awaitable[MCPResponse]]) -> None:
         """Set the async request handler function"""
@@ -59,7 +136,7 @@ class StdioServerTransport:
     async def start(self) -> None:
         """Start the server and process incoming requests"""
         self.running = True
-        logging.info("MCP Server started on stdio")
+        logger.info("MCP Server started on stdio")
 
         try:
             async for line in self._read_stdin():
@@ -69,9 +146,10 @@ class StdioServerTransport:
                 await self._process_line(line)
 
         except KeyboardInterrupt:
-            logging.info("Server interrupted")
+            logger.info("Server interrupted")
         finally:
             self.running = False
+            self.flush()
 
     async def _read_stdin(self):
         """Async generator for reading stdin lines"""
@@ -85,62 +163,96 @@ class StdioServerTransport:
                 line = await reader.readline()
                 if not line:  # EOF
                     break
-                yield line.decode().strip()
+                yield line.strip()
             except Exception as e:
-                logging.error(f"Error reading stdin: {e}")
+                logger.error("Error reading stdin: %s", e)
                 break
 
-    async def _process_line(self, line: str) -> None:
+    async def _process_line(self, line: bytes) -> None:
         """Process a single JSON-RPC line"""
         if not line.strip():
             return
 
+        request = None
         try:
-            data = json.loads(line)
-            request = MCPRequest.from_dict(data)
+            # Decoded straight from the raw bytes (msgspec/orjson when installed)
+            request = MCPRequest.from_json(line)
 
-            logging.debug(f"Processing request: {request.method}")
+            logger.debug("Processing request: %s", request.method)
 
             if self.request_handler:
                 response = await self.request_handler(request)
-                await self._send_response(response)
+                if response is not RESPONSE_DEFERRED:
+                    await self.send_response(response)
             else:
                 # Send error if no handler
                 error_response = MCPResponse(
                     id=request.id,
                     error={"code": -32601, "message": "Method not found"}
                 )
-                await self._send_response(error_response)
+                await self.send_response(error_response)
 
-        except json.JSONDecodeError as e:
-            logging.error(f"Invalid JSON received: {line} - {e}")
+        except json_codec.JSONDecodeError as e:
+            logger.error("Invalid JSON received: %r - %s", line, e)
             error_response = MCPResponse(
                 id=None,
                 error={"code": -32700, "message": "Parse error"}
             )
-            await self._send_response(error_response)
+            await self.send_response(error_response)
         except Exception as e:
-            logging.error(f"Error processing request: {e}")
+            logger.error("Error processing request: %s", e)
             error_response = MCPResponse(
-                id=data.get("id") if 'data' in locals() else None,
+                id=request.id if request is not None else None,
                 error={"code": -32603, "message": "Internal error"}
             )
-            await self._send_response(error_response)
+            await self.send_response(error_response)
 
-    async def _send_response(self, response: MCPResponse) -> None:
+    async def send_response(self, response: MCPResponse) -> None:
         """Send response to stdout"""
-        json_response = json.dumps(response.to_dict())
-        print(json_response)
-        sys.stdout.flush()
-        logging.debug(f"Sent response: {json_response}")
+        json_response = json_codec.dumps(response.to_dict())
+        self._write_line(json_response)
+        logger.debug("Sent response: %r", json_response)
+
+    async def send_encoded_result(self, request_id: Optional[str], result_json: bytes) -> None:
+        """Send a success response whose result is already JSON-encoded"""
+        json_response = b'{"id":' + json_codec.dumps(request_id) + b',"result":' + result_json + b"}"
+        self._write_line(json_response)
+        logger.debug("Sent response: %r", json_response)
 
     async def send_notification(self, method: str, params: Dict[str, Any]) -> None:
         """Send notification (no response expected)"""
         notification = {"method": method, "params": params}
-        json_notification = json.dumps(notification)
-        print(json_notification)
-        sys.stdout.flush()
-        logging.debug(f"Sent notification: {json_notification}")
+        json_notification = json_codec.dumps(notification)
+        self._write_line(json_notification)
+        logger.debug("Sent notification: %r", json_notification)
+
+    def _write_line(self, payload: bytes) -> None:
+        """Queue one encoded JSON-RPC message for stdout, flushed at the end of this loop iteration"""
+        self._pending.append(payload)
+        self._pending.append(b"\n")
+        self._pending_size += len(payload) + 1
+
+        if self._pending_size >= _WRITE_BUFFER_SIZE:
+            self.flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self) -> None:
+        """Write all queued messages to stdout"""
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending.clear()
+        self._pending_size = 0
+        stdout = sys.stdout
+        buffer = getattr(stdout, "buffer", None)
+        if buffer is not None:
+            buffer.write(data)
+        else:  # Replaced stdout (test capture, embedders) without a byte buffer
+            stdout.write(data.decode())
+        stdout.flush()
 
     def stop(self) -> None:
         """Stop the server"""
@@ -166,7 +278,7 @@ async def test_transport():
     transport = StdioServerTransport()
     transport.set_request_handler(echo_handler)
 
-    logging.info("Echo server starting - send JSON-RPC messages")
+    logger.info("Echo server starting - send JSON-RPC messages")
     await transport.start()
 
 
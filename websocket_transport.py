@@ -13,6 +13,7 @@ from typing import Dict, Set, Optional, Callable, Awaitable, Any
 from dataclasses import dataclass
 import uuid
 
+from base_tool import ToolError
 from transport import MCPRequest, MCPResponse
 
 
@@ -237,7 +238,7 @@ class WebSocketMCPServer:
     async def start(self):
         """Start the WebSocket MCP server"""
         # Load plugins
-        tools = await self.plugin_manager.discover_and_load_tools()
+        tools = await self.plugin_manager.ensure_loaded()
         logging.info(f"🔧 Loaded {len(tools)} tools: {list(tools.keys())}")
         
         # Start WebSocket server
@@ -305,7 +306,6 @@ class WebSocketMCPServer:
             )
         
         try:
-            from plugin_manager import ToolError
             result = await self.plugin_manager.execute_tool(tool_name, arguments)
             return MCPResponse(id=request.id, result=result)
         except ToolError as e:
@@ -326,7 +326,7 @@ if __name__ == "__main__":
     async def main():
         from plugin_manager import PluginManager
         
-        plugin_manager = PluginManager("tools")
+        plugin_manager = PluginManager.shared("tools")
         server = WebSocketMCPServer(plugin_manager, host="localhost", port=8765)
         
         try: